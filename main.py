@@ -9,30 +9,31 @@ from datetime import datetime  # 新增导入
 # 设置是否使用CPU时间限制
 use_cpu_time_limit = True  # 设置为True启用CPU时间限制，False使用迭代次数
 cpu_time = 100# 选择CPU时间限制(秒)，可选值如：100, 200, 300, 500
+decode_mode = 'active'  # 解码模式：'active' 插入机器空闲区间（主动调度），'semi-active' 排在机器末尾
 
 da_ = 'Brandimarte_Data'           # 数据案例
 
 if da_== 'Brandimarte_Data':
     a = 'Mk01'                  # 第一个数据案例，生产情况表01到09，
 
-work, Tmachinetime = da.read(da_,a) # 生产情况
-de = decode(work, Tmachinetime) # 解码模块
+instance = da.load(da_,a) # 生产情况（首次加载后使用 data/<数据源>/.cache/ 下的编译缓存）
+de = decode(None, None, instance=instance, mode=decode_mode) # 解码模块
 
 generation, popsize, cr, mu = 2000, 50, 0.8, 0.15      # 迭代次数，种群规模，交叉概率，变异概率
-h = ga(generation, popsize, cr, mu,Tmachinetime,de)
+h = ga(generation, popsize, cr, mu,None,de)
 # 设置CPU时间限制
 if use_cpu_time_limit:
     # 计算总操作数 N
-    total_operations = len(work)
+    total_operations = instance.n_ops
     # 设置时间限制为 CPUtime × N
     time_limit = (cpu_time * total_operations)/1000.0
     # 设置算法的时间限制
-    h.set_time_limit(time_limit)
+    h.set_time_limit(time_limit, kind='cpu')
     print(f"使用CPU时间限制: {cpu_time}秒 × 操作数 = {time_limit:.2f}秒")
 else:
     print(f"使用固定迭代次数: {generation}代")
 
-final_pareto_solutions, best_code = h.total(len(work))
+final_pareto_solutions, best_code = h.total(instance.n_ops)
 
 # 输出最终帕累托前沿
 print("最终帕累托前沿(完工时间, 能量消耗):")
@@ -3,183 +3,505 @@ import time
 import numpy as np
 import os
 from src.algorithms.selection import binary_tournament_selection
-from src.algorithms.crossover import Crossover
-from src.algorithms.mutation import Mutation
-from src.algorithms.sorting import fast_non_dominated_sort, calculate_crowding_distance
+from src.algorithms.variation import Variation
+from src.algorithms.sorting import fast_non_dominated_sort, fronts_to_rank, crowding_distance
 from src.algorithms.initialization import Initialization
+from src.algorithms.parallel import ParallelEvaluator
+from src.algorithms.population import Population
+from src.algorithms.cache import EvaluationCache
+from src.algorithms.local_search import LocalSearch
+from src.algorithms.budget import Budget
+from src.algorithms.checkpoint import save_checkpoint, load_checkpoint
+from src.algorithms.archive import ParetoArchive
+from src.algorithms.termination import StagnationTerminator
+from src.utils.profiler import NULL_PROFILER, ProgressPrinter
+from src.utils.metrics import ConvergenceTrace
 
 class ga:
-    def __init__(self, generation, pop_size, cr, mu, Tmachinetime, de):
+    def __init__(self, generation, pop_size, cr, mu, Tmachinetime, de, batch_decode=True, workers=None, chunksize=None,
+                 cache_size=None, cache_canonical=False, local_search_time=None, profiler=None, progress=None,
+                 archive_size=None, prune_dominated=False):
         self.generation, self.pop_size, self.cr, self.mu = generation, pop_size, cr, mu
+        self.batch_decode = batch_decode  # True: 整个子代一次批量解码；False: 逐个调用 de.caculate
+        # workers > 1 时用常驻进程池评估子代，结果与串行一致
+        self.evaluator = ParallelEvaluator(de, workers, chunksize) if workers and workers > 1 else None
+        # cache_size 不为 None 时启用适应度缓存，复制父代得到的子代不再重复解码；命中统计见 self.cache.stats()
+        self.cache = EvaluationCache(de, cache_size, cache_canonical) if cache_size else None
+        # local_search_time 不为 None 时，每代对第一前沿做关键块局部搜索（模因步骤），单位：秒/代
+        self.local_search_time = local_search_time
+        self.local_search = LocalSearch(de) if local_search_time else None
+        # 岛屿模型的迁移器（src.algorithms.island.Migrator），每代环境选择后与其他岛屿交换个体
+        self.migrator = None
+        # 运行预算（src.algorithms.budget.Budget），由 set_budget / set_time_limit 设置
+        self.budget = None
+        # 剩余预算接近时每评估多少个子代检查一次，None 为种群规模的1/4
+        self.budget_chunk = None
+        # 分阶段计时（src.utils.profiler.Profiler），None 时所有计时钩子为空操作
+        self.profiler = profiler if profiler is not None else NULL_PROFILER
+        # 每代结束时的进度回调 progress(generation, ga)；默认每秒至多输出一次迭代次数，False 不输出
+        self.progress = ProgressPrinter() if progress is None else progress
+        # 外部帕累托存档：每个评估过的个体都会提交，total 返回存档中的解；archive_size 不为 None 时按拥挤度裁剪
+        self.archive = ParetoArchive(archive_size)
+        # prune_dominated=True 时，子代一旦在两个目标上都必然劣于父代第一前沿各目标的最差值就停止解码，
+        # 目标值记为 inf（必然在环境选择中被淘汰）；会改变搜索轨迹，被剪枝的子代数见 self.pruned。
+        # 半主动批量解码（含并行评估）无法逐行停止，剪枝只会增加开销，此时不剪枝
+        self.prune_dominated = prune_dominated
+        self.pruned = 0
+        # 本次运行累计的解码次数（含局部搜索，不含缓存命中），即收敛轨迹的 evaluations 列
+        self.decodes = 0
+        self._decode_bound = None
+        # 收敛轨迹（src.utils.metrics.ConvergenceTrace），由 set_trace 设置
+        self.trace = None
+        # 提前停止判断（src.algorithms.termination.StagnationTerminator），由 set_stagnation 设置
+        self.terminator = None
+        # 最近一次运行的停止原因：'generations'、'budget'、'stagnation' 或 'lower_bound'
+        self.stop_reason = None
+        self._batch_cost = float('inf')  # 评估一整批子代消耗的预算（最近一次的估计），用于判断剩余预算是否足够
+        # 检查点（src.algorithms.checkpoint），由 set_checkpoint 设置
+        self.checkpoint_path = None
+        self.checkpoint_interval = None
+        self._last_checkpoint = None
         self.Tmachinetime = Tmachinetime
         self.de = de
-        self.initialization = Initialization(de.work, Tmachinetime)
-        self.crossover = Crossover(Tmachinetime)  
-        self.mutation = Mutation(Tmachinetime)
-
-    def set_time_limit(self, time_limit):
-        """设置算法运行的时间限制（秒）"""
-        self.time_limit = time_limit
-        self.use_time_limit = True
+        self.initialization = Initialization(de.instance)
+        self.variation = Variation(de.instance)
+
+    def set_budget(self, kind, limit):
+        """
+        设置运行预算：子代按块评估，每块检查一次，预算在代中途用尽时保留已评估的子代并停止
+
+        Args:
+            kind: 'cpu'（主进程 + 工作进程CPU时间，秒）、'wall'（墙钟时间，秒）或 'evals'（解码次数）
+            limit: 预算上限
+        """
+        self.budget = Budget(kind, limit, self.evaluator)
+
+    def set_time_limit(self, time_limit, kind='wall'):
+        """设置算法运行的时间限制（秒），kind='cpu' 时按CPU时间计"""
+        self.set_budget(kind, time_limit)
+
+    def set_trace(self, reference_point, reference_front=None, normalize=True):
+        """
+        每代结束时记录外部存档的超体积，给出参考前沿时同时记录 IGD、GD，结果见 self.trace.rows
+
+        Args:
+            reference_point: 超体积参考点 (C_max, TEC)
+            reference_front: 参考前沿 (m, 2)，如 metrics.load_front 读取的 final_pareto_front.csv
+            normalize: IGD、GD 是否按参考前沿的范围归一化
+        """
+        self.trace = ConvergenceTrace(reference_point, reference_front, normalize)
+
+    def record_trace(self, generation):
+        if self.trace is not None:
+            archive = self.archive
+            self.trace.record(generation, archive.objectives, self.decodes, (archive.accepted, len(archive)))
+
+    def set_stagnation(self, window=20, epsilon=1e-3, reference_point=None, cmax_lower_bound=True):
+        """
+        启用提前停止：最近 window 代外部存档超体积的相对提升小于 epsilon，或最小完工时间达到下界时停止，
+        原因记录在 self.stop_reason
+
+        Args:
+            window: 比较超体积的代数间隔
+            epsilon: 相对提升的阈值
+            reference_point: 超体积参考点 (C_max, TEC)，None 时取初始存档各目标最大值的1.1倍
+            cmax_lower_bound: 完工时间下界，True 时使用解码器的下界 de.lower_bounds.makespan，None 时不检查
+        """
+        if cmax_lower_bound is True:
+            cmax_lower_bound = self.de.lower_bounds.makespan
+        self.terminator = StagnationTerminator(window, epsilon, reference_point, cmax_lower_bound)
+
+    def check_stagnation(self):
+        """每代结束时调用，需要停止时设置 self.stop_reason 并返回 True"""
+        if self.terminator is None:
+            return False
+        reason = self.terminator.update(self.archive)
+        if reason is not None:
+            self.stop_reason = reason
+            return True
+        return False
+
+    def set_checkpoint(self, path, interval=60.0):
+        """
+        运行中定期保存检查点：每代结束时检查，距上次保存超过 interval 秒才写入（interval=0 为每代都写）
+
+        Args:
+            path: 检查点文件路径（.npz）
+            interval: 两次保存的最小间隔（秒）
+        """
+        self.checkpoint_path = path
+        self.checkpoint_interval = interval
             
     def total(self, job_length):
-        population_job = np.zeros((self.pop_size, job_length), dtype=int)
-        population_machine = np.zeros((self.pop_size, job_length), dtype=int)
-        objectives = []  # 存储目标值
+        # 预分配父代/子代缓冲区，迭代过程中各阶段通过视图读写
+        self.population = self.new_population(job_length)
+        self.archive.clear()
+        self.decodes = 0
+
+        # 从这里开始计量预算（初始种群的评估也计入）
+        if self.budget is not None:
+            self.budget.start()
 
-        # 记录开始时间（用于时间限制）
-        start_time = time.time()
+        if self.trace is not None:
+            self.trace.start()
+        if self.terminator is not None:
+            self.terminator.start()
 
         # 初始化种群
-        population_job, population_machine, objectives = self.random_init_population(job_length)
-
-        for generation in range(1, self.generation):
-            # 检查是否达到时间限制
-            if hasattr(self, 'use_time_limit') and self.use_time_limit:
-                current_time = time.time()
-                if current_time - start_time > self.time_limit:
-                    break
-        
-            # 创建子代
-            offspring_job = np.zeros((self.pop_size, job_length), dtype=int)
-            offspring_machine = np.zeros((self.pop_size, job_length), dtype=int)
-            offspring_objectives = []
-
-            # 二元锦标赛选择父代
-            selected_parents = binary_tournament_selection(objectives, population_job, population_machine)
-
-            # 交叉和变异，生成子代
-            for i in range(0, self.pop_size, 2):
-                parent1_job, parent1_machine = selected_parents[i]
-                parent2_job, parent2_machine = selected_parents[i + 1]
-
-                # 交叉
-                if np.random.random() < self.cr:
-                    parent1_job, parent2_job = self.crossover.pox(parent1_job, parent2_job)
-                    parent1_machine, parent2_machine = self.crossover.ux(parent1_machine, parent2_machine)
-                # 变异
-                if np.random.random() < self.mu:
-                    parent1_job = self.mutation.OS_mutation(parent1_job)
-                    parent1_machine = self.mutation.MS_mutation(parent1_machine)
-                    parent2_job  = self.mutation.OS_mutation(parent2_job)
-                    parent2_machine = self.mutation.MS_mutation(parent2_machine)
-
-                # 计算子代目标值
-                offspring1_obj = self.de.caculate(parent1_job, parent1_machine)
-                offspring2_obj = self.de.caculate(parent2_job, parent2_machine)
-
-                # 保存子代
-                offspring_job[i], offspring_machine[i] = parent1_job, parent1_machine
-                offspring_job[i + 1], offspring_machine[i + 1] = parent2_job, parent2_machine
-
-                offspring_objectives.append(offspring1_obj)
-                offspring_objectives.append(offspring2_obj)
+        self.random_init_population(job_length)
+        self.record_trace(0)
+
+        return self.evolve(1)
+
+    def resume(self, path):
+        """
+        从检查点继续运行，与不中断的运行逐位一致（ga 的参数须与保存时相同；不恢复岛屿迁移和模因步骤的计时）
+
+        未调用 set_budget 时沿用检查点中的预算；已设置时只恢复消耗量，可借此放宽上限继续运行。
+        检查点不保存适应度缓存，续跑时缓存从空开始：目标值不受影响，但缓存命中不计入解码次数，
+        因此启用缓存时不支持按解码次数（'evals'）的预算续跑。
+
+        Args:
+            path: save_checkpoint 写出的检查点文件
+
+        Returns:
+            与 total 相同
+        """
+        state = load_checkpoint(path)
+        pop_size, job_length = state['job'].shape
+        if pop_size != self.pop_size:
+            raise ValueError(f'检查点的种群规模为 {pop_size}，与当前设置 {self.pop_size} 不一致')
+        used = state.get('budget')
+        kind = self.budget.kind if self.budget is not None else used['kind'] if used is not None else None
+        if self.cache is not None and kind == 'evals':
+            raise ValueError('启用适应度缓存时不能按解码次数预算续跑：缓存不随检查点保存，续跑后的解码次数与不中断时不同')
+
+        pop = self.new_population(job_length)
+        parents = self.pop_size
+        pop.job[:parents], pop.machine[:parents] = state['job'], state['machine']
+        pop.objectives[:parents] = state['objectives']
+        pop.rank[:parents], pop.crowding[:parents] = state['rank'], state['crowding']
+        self.population = pop
+        self._batch_cost = state['batch_cost']
+        self.archive.clear()
+        self.archive.offer_batch(state['archive_objectives'], state['archive_job'], state['archive_machine'])
+        self.archive.offered, self.archive.accepted = state['archive_counters']
+        self.decodes = state['decodes']
+
+        if used is not None and self.budget is None:
+            self.set_budget(used['kind'], used['limit'])
+        if self.budget is not None:
+            if used is None:
+                self.budget.start()
+            else:
+                self.budget.start(used['evaluations'], used['cpu_time'], used['wall_time'])
+
+        # 提前停止判断和收敛轨迹接着检查点中的状态继续；检查点里没有时（保存时未启用）从头开始
+        if self.trace is not None:
+            if 'trace' in state:
+                self.trace.restore(state['trace'])
+            else:
+                self.trace.start()
+        if self.terminator is not None:
+            if 'stagnation' in state:
+                self.terminator.restore(state['stagnation'])
+            else:
+                self.terminator.start()
+
+        random.setstate(state['random_state'])
+        np.random.set_state(state['np_random_state'])
+        return self.evolve(state['generation'] + 1)
+
+    def new_population(self, job_length):
+        inst = self.de.instance
+        return Population(self.pop_size, job_length, max_gene=max(inst.n_jobs, inst.n_machines))
+
+    def evolve(self, first_generation):
+        """
+        从第 first_generation 代迭代到结束
+
+        Returns:
+            与 total 相同
+        """
+        pop = self.population
+        profiler = self.profiler
+        self._last_checkpoint = time.perf_counter()
+        self.stop_reason = None
+        for generation in range(first_generation, self.generation):
+            # 检查预算是否用尽
+            if self.budget is not None and self.budget.exhausted():
+                self.stop_reason = 'budget'
+                break
+
+            # 二元锦标赛选择父代，按索引一次收集到子代缓冲区
+            started = profiler.start()
+            offspring_job, offspring_machine = pop.offspring_job, pop.offspring_machine
+            winners = binary_tournament_selection(pop.rank[:self.pop_size], pop.crowding[:self.pop_size])
+            np.take(pop.parent_job, winners, axis=0, out=offspring_job)
+            np.take(pop.parent_machine, winners, axis=0, out=offspring_machine)
+            profiler.stop('selection', started)
+
+            # 交叉和变异，对整个交配池批量原地生成子代
+            self.variation.apply(offspring_job, offspring_machine, self.cr, self.mu, profiler)
+
+            # 计算子代目标值
+            started = profiler.start()
+            evaluated = self.evaluate_offspring(pop)
+            profiler.stop('decode', started)
 
             # 环境选择
-            population_job, population_machine, objectives = self.environment_selection(population_job, population_machine, offspring_job, offspring_machine, objectives, offspring_objectives)
-            
-            print('迭代次数:', generation)
+            self.environment_selection(pop, evaluated)
 
-        # 找出帕累托前沿
-        pareto_front = fast_non_dominated_sort(objectives)[0]
+            # 预算在本代中途用尽：已评估的子代参与了环境选择，直接返回当前前沿
+            if evaluated < self.pop_size:
+                profiler.end_generation()
+                self.record_trace(generation)
+                self.stop_reason = 'budget'
+                break
 
-        # 获取去重后的最终帕累托前沿
-        final_pareto_solutions, unique_indices = self.get_final_pareto_front(objectives, pareto_front)
-        best_idx = unique_indices[0]
+            # 模因步骤：在时间预算内改进第一前沿
+            if self.local_search is not None:
+                self.memetic_step(pop)
+
+            # 岛屿模型：发送/接收迁移个体
+            if self.migrator is not None:
+                self.migrator.exchange(self, generation)
+
+            profiler.end_generation()
+            self.record_trace(generation)
+            if self.progress:
+                self.progress(generation, self)
+
+            # 前沿不再改进或完工时间达到下界时提前停止
+            if self.check_stagnation():
+                break
+
+            # 检查点在提前停止判断之后写入，包含本代的判断状态
+            if self.checkpoint_path is not None:
+                now = time.perf_counter()
+                if now - self._last_checkpoint >= self.checkpoint_interval:
+                    save_checkpoint(self.checkpoint_path, self, generation)
+                    self._last_checkpoint = now
+
+        if self.stop_reason is None:
+            self.stop_reason = 'generations'
+        return self.pareto_result()
+
+    def pareto_result(self):
+        """
+        Returns:
+            (存档中按完工时间排序、去重的帕累托前沿, 完工时间最小的个体编码)
+        """
+        solutions = self.archive.solutions()
+        final_pareto_solutions = [objectives for objectives, _, _ in solutions]
 
         #选择Makespan最小的解作为最优解用于绘制甘特图
-        best_job = population_job[best_idx].tolist()
-        best_machine = population_machine[best_idx].tolist()
+        _, best_job, best_machine = solutions[0]
         best_individual = {'OS': best_job,'MS': best_machine}
 
         # 返回最终的帕累托前沿
         return final_pareto_solutions, best_individual
 
-    def get_final_pareto_front(self, objectives, pareto_front):
-        """
-        获取最终的帕累托前沿，并去除重复解
-        
-        参数:
-        objectives -- 目标值列表
-        pareto_front -- 帕累托前沿索引列表
-        
-        返回:
-        unique_solutions -- 去重后的最终帕累托前沿解列表
-        unique_indices -- 去重后的最终帕累托前沿索引列表
-        """
-        # 去除重复的解
-        unique_solutions = []
-        unique_indices = []
-        
-        for idx in pareto_front:
-            solution = objectives[idx]
-            # 检查是否已经存在相同的解
-            is_duplicate = False
-            for existing_solution in unique_solutions:
-                # 如果两个解的目标值非常接近（考虑浮点数精度），则认为是重复的
-                if (abs(solution[0] - existing_solution[0]) < 1e-6 and 
-                    abs(solution[1] - existing_solution[1]) < 1e-6):
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                unique_solutions.append(solution)
-                unique_indices.append(idx)
-        
-        # 按完工时间排序
-        sorted_indices = sorted(range(len(unique_solutions)), key=lambda i: unique_solutions[i][0])
-        unique_solutions = [unique_solutions[i] for i in sorted_indices]
-        unique_indices = [unique_indices[i] for i in sorted_indices]
-        
-        return unique_solutions, unique_indices
-    
-
-    def environment_selection(self, population_job, population_machine, offspring_job, offspring_machine, objectives, offspring_objectives):
-        combined_job = np.vstack((population_job, offspring_job))
-        combined_machine = np.vstack((population_machine, offspring_machine))
-        combined_objectives = objectives + offspring_objectives
+    def close(self):
+        """释放进程池（workers > 1 时）"""
+        if self.evaluator is not None:
+            self.evaluator.close()
+            self.evaluator = None
+
+    def environment_selection(self, pop, n_offspring=None):
+        """
+        环境选择：在合并种群（父代 + 子代）中保留 pop_size 个个体到父代位置
+
+        Args:
+            pop: 种群容器（Population）
+            n_offspring: 参与选择的子代数（前 n_offspring 个），默认全部
+        """
+        n_offspring = self.pop_size if n_offspring is None else n_offspring
+        combined_objectives = pop.objectives[:self.pop_size + n_offspring]
+        profiler = self.profiler
 
+        # 非支配排序 + 所有前沿的拥挤度一次算完
+        started = profiler.start()
         fronts = fast_non_dominated_sort(combined_objectives)
+        rank = fronts_to_rank(fronts, len(combined_objectives))
+        profiler.stop('sort', started)
+        profiler.record_fronts(fronts)
 
-        next_population_indices = []
-        next_objectives = []
-        next_job, next_machine = [], []
+        started = profiler.start()
+        crowding = crowding_distance(combined_objectives, rank)
+        profiler.stop('crowding', started)
 
-        front_index = 0
-        while len(next_population_indices) + len(fronts[front_index]) <= self.pop_size:
-            crowding_distances = calculate_crowding_distance(combined_objectives, fronts[front_index])
+        # 按 (等级, -拥挤度) 一次排序，取前 pop_size 个
+        started = profiler.start()
+        survivors = np.lexsort((-crowding, rank))[:self.pop_size]
+        pop.survive(survivors, rank, crowding)
+        profiler.stop('survivor', started)
 
-            for j in fronts[front_index]:
-                next_population_indices.append(j)
-                next_objectives.append(combined_objectives[j])
-                next_job.append(combined_job[j])
-                next_machine.append(combined_machine[j])
 
-            front_index += 1
+    def memetic_step(self, pop):
+        """
+        对父代第一前沿的个体做关键块局部搜索，用支配原解的改进解原地替换
+
+        Args:
+            pop: 种群容器（Population）
+        """
+        deadline = time.perf_counter() + self.local_search_time
+        parents = self.pop_size
+        first_front = np.flatnonzero(pop.rank[:parents] == 0)
+        improved = False
+        evaluations = self.local_search.evaluations
+        for i in first_front[np.argsort(-pop.crowding[first_front], kind='stable')]:
+            if time.perf_counter() >= deadline:
+                break
+            job, machine, obj, better = self.local_search.improve(
+                pop.job[i], pop.machine[i], pop.objectives[i].tolist(), deadline)
+            if better:
+                pop.job[i], pop.machine[i], pop.objectives[i] = job, machine, obj
+                self.archive.offer(obj, job, machine)
+                improved = True
+        # 局部搜索的解码同样计入评估预算和性能计时器的解码次数
+        evaluations = self.local_search.evaluations - evaluations
+        if self.budget is not None:
+            self.budget.add_evaluations(evaluations)
+        self.profiler.count_evaluations(evaluations)
+        self.decodes += evaluations
 
-        if len(next_population_indices) < self.pop_size:
-            crowding_distances = calculate_crowding_distance(combined_objectives, fronts[front_index])
+        if improved:
+            self.rank_parents()
 
-            sorted_front = sorted(fronts[front_index], key=lambda j: -crowding_distances[j])
+    def emigrants(self, n):
+        """
+        取父代第一前沿中拥挤度最大的至多n个个体，用于迁移
 
-            for j in sorted_front[: self.pop_size - len(next_population_indices)]:
-                next_population_indices.append(j)
-                next_objectives.append(combined_objectives[j])
-                next_job.append(combined_job[j])
-                next_machine.append(combined_machine[j])
+        Returns:
+            (工序编码矩阵, 机器编码矩阵, 目标值数组) 的副本
+        """
+        pop = self.population
+        order = np.lexsort((-pop.crowding[:self.pop_size], pop.rank[:self.pop_size]))
+        chosen = order[:n][pop.rank[order[:n]] == 0]
+        return pop.job[chosen].copy(), pop.machine[chosen].copy(), pop.objectives[chosen].copy()
 
-        return np.array(next_job), np.array(next_machine), next_objectives
+    def immigrate(self, job, machine, objectives):
+        """
+        用迁入个体替换父代中最差（等级最高、拥挤度最小）的个体，并重新计算等级和拥挤度；迁入个体同时提交给外部存档
 
+        Args:
+            job: (k, n) 工序编码
+            machine: (k, n) 机器编码
+            objectives: (k, M) 目标值
+        """
+        self.archive.offer_batch(objectives, job, machine)
+        pop, parents = self.population, self.pop_size
+        k = min(len(job), parents)
+        if k == 0:
+            return
+        worst = np.lexsort((-pop.crowding[:parents], pop.rank[:parents]))[parents - k:]
+        pop.job[worst], pop.machine[worst], pop.objectives[worst] = job[:k], machine[:k], objectives[:k]
+        self.rank_parents()
+
+    def rank_parents(self):
+        """重新计算父代的非支配等级和拥挤度（父代被原地修改后调用）"""
+        pop, parents = self.population, self.pop_size
+        rank = fronts_to_rank(fast_non_dominated_sort(pop.parent_objectives), parents)
+        pop.rank[:parents] = rank
+        pop.crowding[:parents] = crowding_distance(pop.parent_objectives, rank)
+
+    def evaluate(self, population_job, population_machine):
+        """
+        计算一批个体的目标值
+
+        Args:
+            population_job: (P, n) 工序编码矩阵
+            population_machine: (P, n) 机器编码矩阵
+
+        Returns:
+            (P, 2) 目标值数组，每行为 [C_max, TEC]
+        """
+        if self.cache is not None:
+            objectives = self.cache.evaluate(population_job, population_machine, self._decode)
+        else:
+            objectives = self._decode(population_job, population_machine)
+        self.archive.offer_batch(objectives, population_job, population_machine)
+        return objectives
+
+    def evaluate_offspring(self, pop):
+        """
+        计算子代目标值；设置了预算时按块评估并在块之间检查预算
+
+        Args:
+            pop: 种群容器（Population）
+
+        Returns:
+            已评估的子代数（前若干行），预算未用尽时为 pop_size
+        """
+        job, machine, objectives = pop.offspring_job, pop.offspring_machine, pop.offspring_objectives
+        self._decode_bound = self.dominance_bound(pop) if self.prune_dominated and self._can_abort() else None
+        try:
+            return self._evaluate_offspring(job, machine, objectives)
+        finally:
+            self._decode_bound = None
+
+    def _can_abort(self):
+        """解码能否在中途停止：主动解码或逐个解码时可以，半主动批量解码只能整批解码完再剪除"""
+        batch = self.evaluator is not None or self.batch_decode
+        return not batch or self.de.mode != 'semi-active'
+
+    def dominance_bound(self, pop):
+        """
+        Returns:
+            父代第一前沿各目标的最差值 [C_max, TEC]；严格劣于它的子代不可能进入下一代的第一前沿
+        """
+        parents = self.pop_size
+        return pop.objectives[:parents][pop.rank[:parents] == 0].max(axis=0).tolist()
+
+    def _evaluate_offspring(self, job, machine, objectives):
+        if self.budget is None:
+            objectives[:] = self.evaluate(job, machine)
+            return len(job)
+
+        # 批量解码每次调用有固定开销：剩余预算足够时整批评估，接近用尽时才按块评估并在块之间检查
+        # 并行评估时每块至少分给每个工作进程一个个体
+        chunk = self.budget_chunk or -(-self.pop_size // 4)
+        chunk = max(chunk, self.evaluator.workers if self.evaluator is not None else 1)
+        n, done = len(job), 0
+        while done < n and not self.budget.exhausted():
+            size = n - done
+            if self.budget.kind != 'evals' and 2 * self._batch_cost > self.budget.remaining():
+                size = min(size, chunk)
+            size = self.budget.remaining_evaluations(size)
+            if size == 0:
+                break
+            used = self.budget.used()
+            objectives[done:done + size] = self.evaluate(job[done:done + size], machine[done:done + size])
+            # 按块评估时按个体数折算为整批的消耗（含固定开销，估计偏大）
+            self._batch_cost = (self.budget.used() - used) * n / size
+            done += size
+        return done
+
+    def _decode(self, population_job, population_machine):
+        if self.budget is not None:
+            self.budget.add_evaluations(len(population_job))
+        self.profiler.count_evaluations(len(population_job))
+        self.decodes += len(population_job)
+        bound = self._decode_bound
+        if self.evaluator is not None:
+            objectives = self.evaluator.evaluate(population_job, population_machine, bound=bound)
+        elif self.batch_decode:
+            objectives = self.de.caculate_batch(population_job, population_machine, bound)
+        else:
+            objectives = self.de.caculate_rows(population_job, population_machine, bound)
+        if bound is not None:
+            self.pruned += int(np.count_nonzero(np.isinf(objectives[:, 0])))
+        return objectives
 
     def random_init_population(self, job_length):
-        population_job = np.zeros((self.pop_size, job_length), dtype=int)
-        population_machine = np.zeros((self.pop_size, job_length), dtype=int)
-        objectives = []
+        pop = self.population
 
         for i in range(self.pop_size):
             job, machine = self.initialization.creat()
-            obj = self.de.caculate(job, machine)
-            population_job[i], population_machine[i] = job, machine
-            objectives.append(obj)
+            pop.parent_job[i], pop.parent_machine[i] = job, machine
+
+        pop.parent_objectives[:] = self.evaluate(pop.parent_job, pop.parent_machine)
 
-        return population_job, population_machine, objectives
\ No newline at end of file
+        # 初始种群的等级和拥挤度，供第一代锦标赛选择使用
+        self.rank_parents()
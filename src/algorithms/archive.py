@@ -0,0 +1,141 @@
+from bisect import bisect_left, bisect_right
+import numpy as np
+from src.algorithms.sorting import crowding_distance
+
+
+class ParetoArchive:
+    """
+    外部帕累托存档
+
+    每个评估过的个体都可以提交给存档，存档只保留迄今为止互不支配的解及其编码，
+    因此进化过程中找到后又丢失的非支配解不会丢掉。
+
+    - 双目标时按第一个目标升序存放（此时第二个目标严格降序），支配判断和插入位置都用二分查找，
+      被新解支配的成员在插入位置之后连续排列，一次切片删除
+    - 多目标时线性扫描
+    - 目标值完全相同的解视为重复，只保留先到的一个
+    - capacity 不为 None 时，超出容量后删除拥挤度最小的成员（两端的极值解拥挤度为无穷大，总会保留）
+    """
+
+    def __init__(self, capacity=None, n_objectives=2):
+        """
+        Args:
+            capacity: 最多保留的解数，None 为不限
+            n_objectives: 目标数
+        """
+        if capacity is not None and capacity < 2:
+            raise ValueError('存档容量至少为2')
+        self.capacity = capacity
+        self.n_objectives = n_objectives
+        self._points = []   # 目标值元组，按第一个目标升序
+        self._first = []    # 第一个目标，用于二分查找
+        self._job = []
+        self._machine = []
+        self.offered = 0    # 提交的解数
+        self.accepted = 0   # 被接受（当时未被支配且不重复）的解数
+
+    def __len__(self):
+        return len(self._points)
+
+    def offer(self, objectives, job, machine):
+        """
+        提交一个解
+
+        Args:
+            objectives: 目标值
+            job, machine: 编码（被接受时复制保存）
+
+        Returns:
+            是否被接受
+        """
+        point = tuple(float(v) for v in objectives)
+        self.offered += 1
+        if self.n_objectives == 2:
+            pos = self._insert_bi_objective(point)
+        else:
+            pos = self._insert_general(point)
+        if pos is None:
+            return False
+        self._job.insert(pos, np.array(job))
+        self._machine.insert(pos, np.array(machine))
+        self.accepted += 1
+        if self.capacity is not None and len(self._points) > self.capacity:
+            self._prune()
+        return True
+
+    def offer_batch(self, objectives, job, machine):
+        """
+        逐行提交一批解
+
+        Args:
+            objectives: (k, M) 目标值
+            job, machine: (k, n) 编码
+
+        Returns:
+            被接受的解数
+        """
+        accepted = 0
+        for i, point in enumerate(np.asarray(objectives).tolist()):
+            accepted += self.offer(point, job[i], machine[i])
+        return accepted
+
+    def _insert_bi_objective(self, point):
+        c, t = point
+        first, points = self._first, self._points
+        # 第一个目标不大于 c 的成员中，第二个目标最小的是最后一个
+        j = bisect_right(first, c) - 1
+        if j >= 0 and points[j][1] <= t:
+            return None
+        # 被支配的成员：第一个目标 >= c 且第二个目标 >= t，从 start 开始连续排列
+        start = bisect_left(first, c)
+        end = start
+        while end < len(points) and points[end][1] >= t:
+            end += 1
+        if end > start:
+            del first[start:end], points[start:end], self._job[start:end], self._machine[start:end]
+        first.insert(start, c)
+        points.insert(start, point)
+        return start
+
+    def _insert_general(self, point):
+        if self._points:
+            F = np.array(self._points)
+            p = np.array(point)
+            if np.any(np.all(F <= p, axis=1)):
+                return None
+            dominated = np.flatnonzero(np.all(p <= F, axis=1))
+            for i in dominated[::-1]:
+                del self._first[i], self._points[i], self._job[i], self._machine[i]
+        pos = bisect_right(self._first, point[0])
+        self._first.insert(pos, point[0])
+        self._points.insert(pos, point)
+        return pos
+
+    def _prune(self):
+        F = self.objectives
+        i = int(np.argmin(crowding_distance(F, np.zeros(len(F), dtype=np.int64))))
+        del self._first[i], self._points[i], self._job[i], self._machine[i]
+
+    @property
+    def objectives(self):
+        """(k, M) 目标值数组，按第一个目标升序"""
+        return np.array(self._points, dtype=float).reshape(len(self._points), self.n_objectives)
+
+    def genomes(self):
+        """
+        Returns:
+            (工序编码矩阵, 机器编码矩阵)，行与 objectives 对应
+        """
+        return np.array(self._job), np.array(self._machine)
+
+    def solutions(self):
+        """
+        Returns:
+            [(目标值列表, 工序编码列表, 机器编码列表), ...]，按第一个目标升序
+        """
+        return [(list(point), job.tolist(), machine.tolist())
+                for point, job, machine in zip(self._points, self._job, self._machine)]
+
+    def clear(self):
+        self._points, self._first, self._job, self._machine = [], [], [], []
+        self.offered = self.accepted = 0
@@ -0,0 +1,91 @@
+import time
+
+KINDS = ('cpu', 'wall', 'evals')
+
+
+class Budget:
+    """
+    运行预算
+
+    - 'cpu'：主进程的 time.process_time()，加上工作进程（ParallelEvaluator）报告的解码CPU时间，单位：秒
+    - 'wall'：time.perf_counter() 墙钟时间，单位：秒
+    - 'evals'：实际解码的个体数（缓存命中不计）
+
+    检查一次只需一次计时器调用，可在子代评估循环中按块检查。
+    """
+
+    def __init__(self, kind, limit, evaluator=None):
+        """
+        Args:
+            kind: 'cpu'、'wall' 或 'evals'
+            limit: 预算上限
+            evaluator: 并行评估器，kind='cpu' 时计入其工作进程的CPU时间
+        """
+        if kind not in KINDS:
+            raise ValueError(f'未知的预算类型: {kind}，可选 {KINDS}')
+        self.kind = kind
+        self.limit = limit
+        self.evaluator = evaluator
+        self.evaluations = 0
+        self.start()
+
+    def start(self, evaluations=0, cpu_time=0.0, wall_time=0.0):
+        """
+        从当前时刻开始计量（ga.total 开始时调用）；从检查点续跑时传入已消耗的评估次数、CPU时间和墙钟时间
+        """
+        self.evaluations = evaluations
+        self._wall0 = time.perf_counter() - wall_time
+        self._cpu0 = time.process_time() - cpu_time
+        self._worker0 = self._worker_cpu()
+
+    def _worker_cpu(self):
+        return self.evaluator.cpu_time if self.evaluator is not None else 0.0
+
+    def add_evaluations(self, n):
+        self.evaluations += n
+
+    def wall_time(self):
+        return time.perf_counter() - self._wall0
+
+    def cpu_time(self):
+        """主进程与工作进程的CPU时间之和（秒）"""
+        return time.process_time() - self._cpu0 + self._worker_cpu() - self._worker0
+
+    def used(self):
+        """
+        Returns:
+            已使用的预算，单位与 limit 相同
+        """
+        if self.kind == 'cpu':
+            return self.cpu_time()
+        if self.kind == 'wall':
+            return self.wall_time()
+        return self.evaluations
+
+    def remaining(self):
+        return self.limit - self.used()
+
+    def exhausted(self):
+        return self.used() >= self.limit
+
+    def remaining_evaluations(self, n):
+        """
+        本次最多还能评估多少个个体
+
+        Args:
+            n: 待评估的个体数
+
+        Returns:
+            evals 预算下为 min(n, 剩余次数)，时间预算下为 n
+        """
+        if self.kind == 'evals':
+            return max(0, min(n, self.limit - self.evaluations))
+        return n
+
+    def summary(self):
+        """
+        Returns:
+            {'kind', 'limit', 'used', 'evaluations', 'cpu_time', 'wall_time'}
+        """
+        return {'kind': self.kind, 'limit': self.limit, 'used': self.used(), 'evaluations': self.evaluations,
+                'cpu_time': self.cpu_time(), 'wall_time': self.wall_time()}
@@ -0,0 +1,106 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+
+class EvaluationCache:
+    """
+    适应度缓存
+
+    以 (OS, MS) 字节的哈希为键，容量有限，按最近最少使用(LRU)淘汰。
+    canonical=True 时键改为"机器编码 + 每台机器上的工序顺序"：半主动解码的结果只由这两者决定，
+    因此工序编码不同但调度相同的个体也能命中。
+    """
+
+    def __init__(self, de, capacity=100000, canonical=False):
+        """
+        Args:
+            de: 解码器（decode），canonical=True 时用于计算工序索引
+            capacity: 最多缓存的个体数
+            canonical: 是否按调度等价性归一化工序编码
+        """
+        self.de = de
+        self.capacity = capacity
+        # 主动解码会把工序插入更早的空闲区间，结果依赖完整的OS顺序，此时只能按原始编码作键
+        self.canonical = canonical and de.mode == 'semi-active'
+        self._store = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def keys(self, OS_matrix, MS_matrix):
+        """
+        计算一批个体的缓存键
+
+        Args:
+            OS_matrix: (P, n) 工序编码矩阵
+            MS_matrix: (P, n) 机器编码矩阵
+
+        Returns:
+            长度为P的键列表
+        """
+        OS_matrix = np.ascontiguousarray(OS_matrix)
+        MS_matrix = np.ascontiguousarray(MS_matrix)
+        if self.canonical:
+            # 每个位置的工序及其机器，按机器稳定排序即得到每台机器上的加工顺序
+            rows = np.arange(len(OS_matrix))[:, None]
+            op_at = self.de.operation_index(OS_matrix)
+            machine_at = MS_matrix[rows, op_at]
+            machine_order = np.argsort(machine_at, axis=1, kind='stable')
+            # 工序索引的取值范围是工序总数而不是工件数/机器数，用 int32 以免超过 65535 道工序时回绕
+            OS_matrix = np.ascontiguousarray(op_at[rows, machine_order].astype(np.int32))
+        return [hashlib.blake2b(OS_matrix[i].tobytes() + MS_matrix[i].tobytes(), digest_size=16).digest()
+                for i in range(len(OS_matrix))]
+
+    def evaluate(self, OS_matrix, MS_matrix, evaluate_fn):
+        """
+        先查缓存，只对未命中的个体调用 evaluate_fn（同一批中的重复个体也只计算一次）
+
+        Args:
+            OS_matrix: (P, n) 工序编码矩阵
+            MS_matrix: (P, n) 机器编码矩阵
+            evaluate_fn: 批量评估函数 (OS_matrix, MS_matrix) -> (P, M) 目标值数组
+
+        Returns:
+            (P, M) 目标值数组
+        """
+        keys = self.keys(OS_matrix, MS_matrix)
+        if not keys:
+            return np.zeros((0, 2))
+        results = [None] * len(keys)
+        pending = {}  # 未命中的键 -> 批内第一次出现的行
+        for i, key in enumerate(keys):
+            value = self._store.get(key)
+            if value is not None:
+                self._store.move_to_end(key)
+                results[i] = value
+                self.hits += 1
+            elif key in pending:
+                self.hits += 1
+            else:
+                pending[key] = i
+                self.misses += 1
+
+        if pending:
+            rows = np.fromiter(pending.values(), dtype=np.int64, count=len(pending))
+            computed = np.asarray(evaluate_fn(OS_matrix[rows], MS_matrix[rows]), dtype=float)
+            for key, value in zip(pending, computed):
+                # 被支配界剪枝的个体（目标值为 inf）取决于当时的界，不缓存
+                if np.isfinite(value[0]):
+                    self._store[key] = value
+            while len(self._store) > self.capacity:
+                self._store.popitem(last=False)
+            fresh = dict(zip(pending, computed))
+            for i, key in enumerate(keys):
+                if results[i] is None:
+                    results[i] = fresh[key]
+
+        return np.array(results, dtype=float).reshape(len(keys), -1)
+
+    def stats(self):
+        """
+        Returns:
+            {'hits', 'misses', 'hit_rate', 'size', 'capacity'}
+        """
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._store), 'capacity': self.capacity}
@@ -0,0 +1,115 @@
+'''
+ga 运行状态的检查点
+
+一个检查点是一个未压缩的 .npz 文件，包含一代结束时的父代编码、目标值、等级、拥挤度、外部存档、代数、
+已消耗的预算、提前停止判断和收敛轨迹的状态以及 random 和 np.random 两个随机数生成器的状态。写入时先写临时文件再 os.replace，
+中断时磁盘上只会有完整的旧检查点或完整的新检查点。
+'''
+import os
+import random
+import numpy as np
+
+FORMAT_VERSION = 3
+
+
+def save_checkpoint(path, h, generation):
+    """
+    把 ga 的当前状态写入检查点（在一代结束时调用）
+
+    Args:
+        path: 检查点文件路径
+        h: ga 实例
+        generation: 已完成的代数
+    """
+    pop, parents = h.population, h.pop_size
+    py_version, py_state, py_gauss = random.getstate()
+    np_name, np_keys, np_pos, np_has_gauss, np_gauss = np.random.get_state()
+    budget = h.budget
+    archive_job, archive_machine = h.archive.genomes()
+    arrays = {
+        'format_version': FORMAT_VERSION,
+        'generation': generation,
+        'job': pop.job[:parents],
+        'machine': pop.machine[:parents],
+        'objectives': pop.objectives[:parents],
+        'rank': pop.rank[:parents],
+        'crowding': pop.crowding[:parents],
+        'batch_cost': h._batch_cost,
+        'archive_objectives': h.archive.objectives,
+        'archive_job': archive_job,
+        'archive_machine': archive_machine,
+        'archive_offered': h.archive.offered,
+        'archive_accepted': h.archive.accepted,
+        'decodes': h.decodes,
+        'py_random_version': py_version,
+        'py_random_state': np.asarray(py_state, dtype=np.uint32),
+        'py_random_gauss': np.nan if py_gauss is None else py_gauss,
+        'np_random_name': np_name,
+        'np_random_keys': np_keys,
+        'np_random_pos': np_pos,
+        'np_random_has_gauss': np_has_gauss,
+        'np_random_gauss': np_gauss,
+    }
+    if budget is not None:
+        arrays.update({'budget_kind': budget.kind, 'budget_limit': budget.limit,
+                       'budget_evaluations': budget.evaluations,
+                       'budget_cpu_time': budget.cpu_time(), 'budget_wall_time': budget.wall_time()})
+    if h.terminator is not None:
+        arrays.update({f'stagnation_{key}': value for key, value in h.terminator.state().items()})
+    if h.trace is not None:
+        arrays.update({f'trace_{key}': value for key, value in h.trace.state().items()})
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    # 传入文件对象，避免 np.savez 给文件名追加 .npz 后缀
+    with open(tmp, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path):
+    """
+    读取检查点
+
+    Returns:
+        字典：'generation'、'job'、'machine'、'objectives'、'rank'、'crowding'、'batch_cost'、
+        'archive_objectives'、'archive_job'、'archive_machine'、'archive_counters'（外部存档及其 offered、accepted 计数）、
+        'decodes'（累计解码次数）、
+        'random_state'（random.setstate 的参数）、'np_random_state'（np.random.set_state 的参数），
+        以及保存时设置了预算才有的 'budget'：{'kind', 'limit', 'evaluations', 'cpu_time', 'wall_time'}，
+        设置了提前停止才有的 'stagnation' 和设置了收敛轨迹才有的 'trace'（StagnationTerminator / ConvergenceTrace.restore 的参数）
+    """
+    with np.load(path, allow_pickle=False) as data:
+        version = int(data['format_version'])
+        if version != FORMAT_VERSION:
+            raise ValueError(f'不支持的检查点版本: {version}')
+        gauss = float(data['py_random_gauss'])
+        state = {
+            'generation': int(data['generation']),
+            'job': data['job'],
+            'machine': data['machine'],
+            'objectives': data['objectives'],
+            'rank': data['rank'],
+            'crowding': data['crowding'],
+            'batch_cost': float(data['batch_cost']),
+            'archive_objectives': data['archive_objectives'],
+            'archive_job': data['archive_job'],
+            'archive_machine': data['archive_machine'],
+            'archive_counters': (int(data['archive_offered']), int(data['archive_accepted'])),
+            'decodes': int(data['decodes']),
+            'random_state': (int(data['py_random_version']), tuple(int(x) for x in data['py_random_state']),
+                             None if np.isnan(gauss) else gauss),
+            'np_random_state': (str(data['np_random_name']), data['np_random_keys'], int(data['np_random_pos']),
+                                int(data['np_random_has_gauss']), float(data['np_random_gauss'])),
+        }
+        if 'budget_kind' in data:
+            state['budget'] = {'kind': str(data['budget_kind']), 'limit': data['budget_limit'].item(),
+                               'evaluations': int(data['budget_evaluations']),
+                               'cpu_time': float(data['budget_cpu_time']),
+                               'wall_time': float(data['budget_wall_time'])}
+        for prefix in ('stagnation', 'trace'):
+            keys = [key for key in data.files if key.startswith(prefix + '_')]
+            if keys:
+                state[prefix] = {key[len(prefix) + 1:]: data[key] for key in keys}
+    return state
@@ -4,10 +4,28 @@ from matplotlib.pylab import mpl
 import matplotlib.patches as patches
 from datetime import datetime
 import os
+import math
+from bisect import bisect_right
+from src.utils.instance import Instance, INELIGIBLE
+from src.utils.bounds import LowerBounds
 mpl.rcParams['font.sans-serif'] = ['SimHei'] 
 
 class decode:
-    def __init__(self, work, Tmachinetime):
+    # 能耗参数（可根据实际情况调整）
+    processing_power = 30.0  # 加工功率 kW
+    idle_power = 1.0         # 空闲功率 kW
+
+    def __init__(self, work, Tmachinetime, instance=None, mode='semi-active'):
+        """
+        Args:
+            work: 每道工序所属工件（给出 instance 时可为 None）
+            Tmachinetime: 每道工序的可选机器和加工时间（给出 instance 时可为 None）
+            instance: 编译后的算例（如 data.load 的返回值），None 时由 work、Tmachinetime 构建
+            mode: 'semi-active' 工序按OS顺序排在机器末尾；'active' 工序插入机器上最早能容纳它的空闲区间
+        """
+        if mode not in ('semi-active', 'active'):
+            raise ValueError(f'未知的解码模式: {mode}')
+        self.mode = mode
         self.work = work
         self.Tmachinetime = Tmachinetime
         '''
@@ -18,65 +36,134 @@ class decode:
             ...
         ]
         '''
+        # 编译后的算例：工件首工序偏移 + 加工时间矩阵，解码时不再做列表查找
+        self.instance = instance if instance is not None else Instance.compile(work, Tmachinetime)
+        self._job_start = self.instance.job_start.tolist()
+        self._proc_time = self.instance.proc_time.tolist()
+        # 完工时间与能耗的下界（src.utils.bounds.LowerBounds）
+        self.lower_bounds = LowerBounds(self.instance, self.processing_power, self.idle_power)
+
+    def caculate(self, OS, MS, draw_gantt=False, bound=None):
+        """
+        Args:
+            OS: 工序编码
+            MS: 机器编码
+            draw_gantt: 是否绘制甘特图
+            bound: 支配界，一个点 [C_max, TEC]（如当前第一前沿各目标的最大值）或 (k, 2) 个点（如外部存档）；
+                   给出时，一旦完工时间和能耗的下界都超过其中某个点（个体被它严格支配）就停止解码并返回 None
+
+        Returns:
+            目标值 [C_max, TEC]，提前终止时为 None
+        """
+        if bound is None:
+            return self._caculate(OS, MS, draw_gantt)
+        static, limit, tail = self._bound_arrays([MS], bound, True)
+        if static[0] > limit[0]:
+            return None
+        return self._caculate(OS, MS, draw_gantt, self._thresholds(limit[0], tail[0]))
+
+    def caculate_rows(self, OS_matrix, MS_matrix, bound=None):
+        """
+        逐个解码一批个体；给出 bound 时下界只为整批计算一次，被 bound 严格支配的个体目标值为 inf
+
+        Args:
+            OS_matrix: (P, n) 工序编码矩阵
+            MS_matrix: (P, n) 机器编码矩阵
+            bound: 支配界，见 caculate
+
+        Returns:
+            (P, 2) 目标值数组
+        """
+        if bound is None:
+            results = [self._caculate(OS, MS) for OS, MS in zip(OS_matrix, MS_matrix)]
+        else:
+            static, limit, tail = self._bound_arrays(MS_matrix, bound, True)
+            keep = (static <= limit).tolist()
+            results = [self._caculate(OS_matrix[k], MS_matrix[k], False, self._thresholds(limit[k], tail[k]))
+                       if keep[k] else None for k in range(len(keep))]
+        return np.array([[np.inf, np.inf] if r is None else r for r in results], dtype=float).reshape(-1, 2)
+
+    def start_times(self, OS, MS):
+        """
+        解码并给出每道工序的开始时间（与 caculate 相同的调度）
 
-    def caculate(self, OS, MS, draw_gantt=False):
+        Returns:
+            (目标值 [C_max, TEC], 开始时间列表，按工序索引)
+        """
+        starts = [0] * self.instance.n_ops
+        return self._caculate(OS, MS, starts=starts), starts
+
+    def _caculate(self, OS, MS, draw_gantt=False, threshold=None, starts=None):
+        """
+        解码；threshold 不为 None 时，一旦某工序的完工时间超过 threshold[工序] 就返回 None；
+        starts 不为 None 时把每道工序的开始时间写入 starts[工序]
+        """
+        if isinstance(OS, np.ndarray):
+            OS = OS.tolist()
+        if isinstance(MS, np.ndarray):
+            MS = MS.tolist()
         job_num, machine_num = max(OS), max(MS)
-        t_job = np.zeros((1, job_num), dtype=int)
-        t_mac = np.zeros((1, machine_num), dtype=int)
-        
+        job_start, proc_time = self._job_start, self._proc_time
+        t_job = [0] * job_num
+        t_mac = [0] * self.instance.n_machines
+        count = [0] * job_num
+
         # 甘特图数据收集
         gantt_data = {
             'machines': []      # 机器加工任务
         }
-        
-        # 能耗计算相关变量
-        machine_processing_energy = np.zeros(machine_num)  # 机器加工能耗
-        machine_processing_time = np.zeros(machine_num)    # 每台机器的总加工时间
-        
-        # 能耗参数（可根据实际情况调整）
-        processing_power = 30.0  # 加工功率 kW
-        idle_power = 1.0         # 空闲功率 kW
-        
-        startime = 0
-        count = np.zeros((1, job_num), dtype=int)
 
-        for i in range(len(OS)):
-            jo = OS[i] - 1
-            idx = self.work.index(jo + 1) + count[0, jo]
-            ma = MS[idx]
-            
-            # 经典FJSP：机器开始时间 = max(工件完成时间, 机器可用时间)
-            startime = max(t_mac[0, ma-1], t_job[0, jo])
-            
-            # 从Tmachinetime中查找对应的加工时间
-            processing_time = self.get_processing_time(idx, ma)
-            gantt_data['machines'].append({
-                'machine_id': ma,
-                'start_time': startime,
-                'end_time': startime + processing_time,
-                'job_id': jo + 1,
-                'operation': count[0, jo] + 1,
-                'processing_time': processing_time
-            })
-            
-            # 计算机器加工能耗
-            machine_processing_energy[ma-1] += processing_time * processing_power
-            # 累计该机器的总加工时长（用于计算空闲能耗）
-            machine_processing_time[ma-1] += processing_time
-            
-            t_mac[0, ma-1] = startime + processing_time
-            t_job[0, jo] = startime + processing_time
-            count[0, jo] += 1
+        total_processing_time = 0  # 所有机器的总加工时间
 
-        C_max = max(t_job[0])
-        
-        # 按公式逐机器计算空闲能耗
-        machine_idle_energy = np.zeros(machine_num)
-        for k in range(machine_num):
-            idle_time_k = C_max - machine_processing_time[k]
-            machine_idle_energy[k] = idle_power * idle_time_k
+        record = draw_gantt or starts is not None
+        active = self.mode == 'active'
+        if active:
+            # 每台机器的空闲区间索引
+            gaps = [_IdleIntervals() for _ in range(self.instance.n_machines)]
+
+        for jo in OS:
+            jo -= 1
+            idx = job_start[jo] + count[jo]
+            ma = MS[idx] - 1
+            processing_time = proc_time[idx][ma]
+
+            if active and gaps[ma].last_end > t_job[jo]:
+                # 主动调度：机器上可能有结束晚于工件就绪时间的空闲区间时，尝试插入最早能容纳该工序的区间
+                startime = _insert_into_gap(gaps[ma], t_mac, ma, t_job[jo], processing_time)
+            else:
+                # 经典FJSP：机器开始时间 = max(工件完成时间, 机器可用时间)
+                startime = t_mac[ma] if t_mac[ma] > t_job[jo] else t_job[jo]
+                if active and startime > t_mac[ma]:
+                    gaps[ma].add(t_mac[ma], startime)   # 机器等待工件的时间成为新的空闲区间
+                t_mac[ma] = startime + processing_time
+            endtime = startime + processing_time
+
+            if record:
+                if starts is not None:
+                    starts[idx] = startime
+                if draw_gantt:
+                    gantt_data['machines'].append({
+                        'machine_id': ma + 1,
+                        'start_time': startime,
+                        'end_time': endtime,
+                        'job_id': jo + 1,
+                        'operation': count[jo] + 1,
+                        'processing_time': processing_time
+                    })
+
+            total_processing_time += processing_time
+            t_job[jo] = endtime
+            count[jo] += 1
 
-        TEC = np.sum(machine_processing_energy) + np.sum(machine_idle_energy)
+            # 工件的后续工序只能在 endtime 之后串行加工，完工时间至少为 endtime 加上它们的加工时间
+            if threshold is not None and endtime > threshold[idx]:
+                return None
+
+        C_max = max(t_job)
+
+        # 加工能耗 + 空闲能耗，空闲能耗按机器累加：sum_k idle_power * (C_max - 机器k的加工时长)
+        TEC = (self.processing_power * total_processing_time
+               + self.idle_power * (machine_num * C_max - total_processing_time))
 
         # 绘制甘特图
         if draw_gantt:
@@ -84,10 +171,146 @@ class decode:
 
         return [C_max, TEC]
 
+    def _bound_arrays(self, MS_matrix, bound, with_tail=False):
+        """
+        机器编码确定了每道工序的加工时间，由此得到解码前的下界和解码中途使用的剩余加工时间
+
+        Args:
+            MS_matrix: (P, n) 机器编码矩阵
+            bound: 支配界，一个点 [C_max, TEC] 或 (k, 2) 个点（如外部存档），被其中任一点严格支配即可剪除
+            with_tail: 是否计算 tail（逐个解码时使用）
+
+        Returns:
+            (完工时间下界 (P,)：最长工件总加工时间与最大机器负载的较大者,
+             完工时间阈值 (P,)：完工时间超过它时，个体在两个目标上都劣于 bound 中的某个点,
+             tail (P, n)：每道工序完工后其工件剩余工序的加工时间之和)
+        """
+        inst = self.instance
+        machines = np.asarray(MS_matrix, dtype=np.int64) - 1
+        P, n = machines.shape
+        pt = inst.proc_time[np.arange(n), machines]
+        per_job = np.add.reduceat(pt, inst.job_start[:-1], axis=1)
+        rows = np.arange(P)[:, None] * inst.n_machines
+        per_machine = np.bincount((rows + machines).ravel(), weights=pt.ravel(), minlength=P * inst.n_machines)
+        static = np.maximum(per_job.max(axis=1), per_machine.reshape(P, inst.n_machines).max(axis=1))
+
+        tail = None
+        if with_tail:
+            # suffix[:, i] 为工序 i 起所有工序的加工时间之和，减去下一个工件起的部分即为工件内的剩余量
+            suffix = np.zeros((P, n + 1), dtype=np.int64)
+            suffix[:, :n] = np.cumsum(pt[:, ::-1], axis=1)[:, ::-1]
+            tail = suffix[:, 1:] - suffix[:, inst.job_start[1:][inst.op_job]]
+
+        limit = self._cmax_limit(bound, machines.max(axis=1) + 1, pt.sum(axis=1))
+        return static, limit, tail
+
+    def _cmax_limit(self, bound, machine_num, total_processing_time):
+        """
+        完工时间阈值 (P,)：完工时间超过它时，个体在两个目标上都劣于 bound 中的某个点
+
+        Args:
+            bound: 支配界，一个点 [C_max, TEC] 或 (k, 2) 个点
+            machine_num: (P,) 编码中用到的最大机器号
+            total_processing_time: (P,) 总加工时间
+        """
+        # TEC = (加工功率 - 空闲功率) × 总加工时间 + 空闲功率 × 最大机器号 × C_max，是 C_max 的增函数，
+        # 换算为每个点对应的完工时间阈值，再对所有点取最小
+        points = np.asarray(bound, dtype=float).reshape(-1, 2)
+        slope = (self.idle_power * machine_num)[:, None]
+        fixed = ((self.processing_power - self.idle_power) * total_processing_time)[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            energy_limit = np.where(slope > 0, (points[:, 1] - fixed) / slope,
+                                    np.where(fixed > points[:, 1], -np.inf, np.inf))
+        return np.maximum(points[:, 0], energy_limit).min(axis=1)
+
+    @staticmethod
+    def _thresholds(limit, tail):
+        """
+        把完工时间阈值换算为每道工序完工时间的阈值（加工时间为整数，C_max 也是整数，阈值取整后只需一次整数比较）；
+        阈值为无穷大时不可能剪除，返回 None
+        """
+        if limit == np.inf:
+            return None
+        return (math.floor(limit) - tail).tolist()
+
+    def caculate_batch(self, OS_matrix, MS_matrix, bound=None):
+        """
+        批量解码：一次计算整个种群的目标值，结果与逐个调用 caculate 完全一致
+
+        每个位置只循环一次，用花式索引同时更新P个个体的工件/机器时钟。
+
+        Args:
+            OS_matrix: (P, n) 工序编码矩阵
+            MS_matrix: (P, n) 机器编码矩阵
+            bound: 支配界，见 caculate；被 bound 严格支配的个体目标值为 inf（与 caculate_rows 剪除的个体相同）。
+                   半主动解码时不在循环中途停止（逐行判断和压缩的开销超过省下的解码），
+                   整批解码完后按完工时间阈值统一剪除，不会更快
+
+        Returns:
+            (P, 2) 目标值数组，每行为 [C_max, TEC]
+        """
+        if self.mode != 'semi-active':
+            # 主动解码的插空过程依赖每个个体各自的空闲区间，逐个解码
+            return self.caculate_rows(OS_matrix, MS_matrix, bound)
+
+        jobs = np.asarray(OS_matrix, dtype=np.int64) - 1
+        machines = np.asarray(MS_matrix, dtype=np.int64) - 1
+        P, n = jobs.shape
+        inst = self.instance
+        J, M = inst.n_jobs, inst.n_machines
+        rows = np.arange(P)[:, None]
+
+        op_at = self.operation_index(jobs + 1)
+
+        # 每个位置选用的机器和加工时间，以及工件/机器时钟在展平数组中的下标
+        ma_at = machines[rows, op_at]
+        pt_at = inst.proc_time[op_at, ma_at]
+        job_slot = (rows * J + jobs).T.copy()
+        mac_slot = (rows * M + ma_at).T.copy()
+        pt_at = pt_at.T.copy()
+
+        t_job = np.zeros(P * J, dtype=np.int64)
+        t_mac = np.zeros(P * M, dtype=np.int64)
+        for i in range(n):
+            js, ms = job_slot[i], mac_slot[i]
+            endtime = np.maximum(t_mac[ms], t_job[js]) + pt_at[i]
+            t_mac[ms] = endtime
+            t_job[js] = endtime
+
+        C_max = t_job.reshape(P, J).max(axis=1)
+        total_processing_time = pt_at.sum(axis=0)
+        machine_num = machines.max(axis=1) + 1
+        TEC = (self.processing_power * total_processing_time
+               + self.idle_power * (machine_num * C_max - total_processing_time))
+
+        objectives = np.column_stack((C_max, TEC)).astype(float)
+        if bound is not None:
+            # 逐个解码时某工序完工时间加剩余加工时间超过阈值才剪除，与最终完工时间超过阈值等价
+            objectives[C_max > self._cmax_limit(bound, machine_num, total_processing_time)] = np.inf
+        return objectives
+
+    def operation_index(self, OS_matrix):
+        """
+        每个基因位置对应的工序索引（即 Tmachinetime 中的下标）
+
+        按工件稳定排序后，第k个位置恰好对应工序k（同一工件的工序连续存放）。
+
+        Args:
+            OS_matrix: (P, n) 工序编码矩阵
+
+        Returns:
+            (P, n) 工序索引矩阵
+        """
+        OS_matrix = np.asarray(OS_matrix)
+        P, n = OS_matrix.shape
+        order = np.argsort(OS_matrix, axis=1, kind='stable')
+        op_at = np.empty_like(order)
+        op_at[np.arange(P)[:, None], order] = np.arange(n)
+        return op_at
 
     def get_processing_time(self, operation_idx, machine_id):
         """
-        根据工序索引和机器ID从Tmachinetime中查找对应的加工时间
+        根据工序索引和机器ID查找对应的加工时间
         
         Args:
             operation_idx: 工序在Tmachinetime中的索引
@@ -96,12 +319,10 @@ class decode:
         Returns:
             processing_time: 对应的加工时间
         """
-        if operation_idx < len(self.Tmachinetime):
-            machine_time_pairs = self.Tmachinetime[operation_idx]
-            # Tmachinetime格式：[machine1, time1, machine2, time2, ...]
-            for i in range(0, len(machine_time_pairs), 2):
-                if i + 1 < len(machine_time_pairs) and machine_time_pairs[i] == machine_id:
-                    return machine_time_pairs[i + 1]
+        if 0 <= operation_idx < self.instance.n_ops and 1 <= machine_id <= self.instance.n_machines:
+            processing_time = self._proc_time[operation_idx][machine_id - 1]
+            if processing_time != INELIGIBLE:
+                return processing_time
         
         # 如果没找到，返回默认值（这种情况不应该发生）
         print(f"Warning: No processing time found for operation {operation_idx} on MS {machine_id}")
@@ -277,3 +498,241 @@ class decode:
         plt.show()
         
         return filepath
+
+
+
+class _IdleIntervals:
+    """
+    一台机器的空闲区间 [start, end)，互不重叠，按 start 排序
+
+    区间数不超过 LINEAR_LIMIT 时存放在两个有序列表中，二分定位后顺序检查（区间少时常数最小）；
+    超过后整体转入 treap：每个结点记录子树中最长空闲区间的长度，查找最早能容纳某道工序的区间时
+    整棵放不下的子树直接跳过，查找、插入、切分的期望复杂度均为 O(log k)。
+    结点的优先级由结点编号的乘法散列得到，不消耗全局随机数；各操作都用循环实现，
+    沿途经过的结点按自底向上的顺序重新计算最长区间。
+    """
+    __slots__ = ('gap_start', 'gap_end', 'start', 'end', 'left', 'right', 'priority', 'longest', 'root', 'last_end')
+    LINEAR_LIMIT = 32
+
+    def __init__(self):
+        self.gap_start, self.gap_end = [], []
+        self.start, self.end, self.left, self.right, self.priority, self.longest = [], [], [], [], [], []
+        self.root = -1
+        self.last_end = 0   # 不小于所有区间的结束时间，用于跳过不可能插空的查找
+
+    def _build(self):
+        """列表中的区间转入 treap"""
+        gap_start, gap_end = self.gap_start, self.gap_end
+        self.gap_start = self.gap_end = None
+        for start, end in zip(gap_start, gap_end):
+            self._insert(start, end)
+
+    def add(self, start, end):
+        """加入机器末尾等待形成的空闲区间（晚于已有的所有区间）"""
+        if end > self.last_end:
+            self.last_end = end
+        if self.gap_end is None:
+            self._insert(start, end)
+            return
+        self.gap_start.append(start)
+        self.gap_end.append(end)
+        if len(self.gap_end) > self.LINEAR_LIMIT:
+            self._build()
+
+    def _pull(self, nodes):
+        """按 nodes 的逆序（先子后父）重新计算子树中的最长区间"""
+        start, end, left, right, longest = self.start, self.end, self.left, self.right, self.longest
+        for x in reversed(nodes):
+            best = end[x] - start[x]
+            child = left[x]
+            if child >= 0 and longest[child] > best:
+                best = longest[child]
+            child = right[x]
+            if child >= 0 and longest[child] > best:
+                best = longest[child]
+            longest[x] = best
+
+    def _insert(self, start, end):
+        starts, left, right, priorities = self.start, self.left, self.right, self.priority
+        n = len(starts)
+        priority = (n + 1) * 2654435761 & 0xFFFFFFFF
+        starts.append(start)
+        self.end.append(end)
+        left.append(-1)
+        right.append(-1)
+        priorities.append(priority)
+        self.longest.append(end - start)
+
+        # 沿查找路径下降到第一个优先级低于新结点的位置，新结点挂在这里
+        path = []
+        parent = -1
+        x = self.root
+        while x >= 0 and priorities[x] >= priority:
+            path.append(x)
+            parent = x
+            x = left[x] if start < starts[x] else right[x]
+        depth = len(path)
+        if parent < 0:
+            self.root = n
+        elif start < starts[parent]:
+            left[parent] = n
+        else:
+            right[parent] = n
+        # 原来在该位置的子树按 start 分成两半，作为新结点的左右子树
+        left_tail = right_tail = n
+        while x >= 0:
+            path.append(x)
+            if starts[x] < start:
+                if left_tail == n:
+                    left[n] = x
+                else:
+                    right[left_tail] = x
+                left_tail, x = x, right[x]
+            else:
+                if right_tail == n:
+                    right[n] = x
+                else:
+                    left[right_tail] = x
+                right_tail, x = x, left[x]
+        if left_tail != n:
+            right[left_tail] = -1
+        if right_tail != n:
+            left[right_tail] = -1
+        # 分开的两条链都在新结点之下，先于新结点及其祖先重新计算
+        self._pull(path[:depth] + [n] + path[depth:])
+
+    def _replace(self, key, start, end):
+        """把起点为 key 的区间改为 [start, end)（新区间在原区间之内，顺序不变）；start == end 时删除"""
+        starts, left, right, priorities = self.start, self.left, self.right, self.priority
+        path = []
+        parent = -1
+        x = self.root
+        while starts[x] != key:
+            path.append(x)
+            parent = x
+            x = left[x] if key < starts[x] else right[x]
+        if start < end:
+            starts[x], self.end[x] = start, end
+            path.append(x)
+            self._pull(path)
+            return
+        # 删除：沿左子树的右链和右子树的左链按优先级合并，接回父结点
+        a, b = left[x], right[x]
+        slot, slot_right = parent, parent >= 0 and key > starts[parent]
+        while True:
+            if a < 0 or b < 0:
+                child = a if b < 0 else b
+            else:
+                child = a if priorities[a] > priorities[b] else b
+            if slot < 0:
+                self.root = child
+            elif slot_right:
+                right[slot] = child
+            else:
+                left[slot] = child
+            if a < 0 or b < 0:
+                break
+            path.append(child)
+            if child == a:
+                slot, slot_right, a = a, True, right[a]
+            else:
+                slot, slot_right, b = b, False, left[b]
+        self._pull(path)
+
+    def occupy(self, release, duration):
+        """
+        找到最早能容纳 [开始时间, 开始时间 + duration) 且开始时间不早于 release 的空闲区间并占用它
+
+        Returns:
+            开始时间，没有合适的空闲区间时为 None
+        """
+        if release >= self.last_end:
+            return None
+        if self.gap_end is not None:
+            return self._occupy_linear(release, duration)
+        longest = self.longest
+        if longest[self.root] < duration:
+            return None
+        start, end, left, right = self.start, self.end, self.left, self.right
+        # 中序查找第一个可行区间：结束不晚于 release 的结点及其左子树整体跳过，
+        # 放不下的子树整体跳过；待检查的结点入栈，左子树找不到时再检查结点本身和右子树
+        stack = []
+        x = self.root
+        found = -1
+        while found < 0:
+            while x >= 0 and longest[x] >= duration:
+                if end[x] > release:
+                    stack.append(x)
+                    x = left[x]
+                else:
+                    x = right[x]
+            if not stack:
+                return None
+            y = stack.pop()
+            begin = start[y] if start[y] > release else release
+            if begin + duration <= end[y]:
+                found = y
+            else:
+                x = right[y]
+
+        gap_start, gap_end = start[found], end[found]
+        begin = gap_start if gap_start > release else release
+        finish = begin + duration
+        # 切分空闲区间：保留左右两段中长度大于0的部分
+        if begin > gap_start:
+            self._replace(gap_start, gap_start, begin)
+            if finish < gap_end:
+                self._insert(finish, gap_end)
+        else:
+            self._replace(gap_start, finish, gap_end)
+        return begin
+
+    def _occupy_linear(self, release, duration):
+        gap_start, gap_end = self.gap_start, self.gap_end
+        # 二分找到第一个结束时间晚于release的空闲区间，只从这里开始向后检查
+        k = bisect_right(gap_end, release)
+        while k < len(gap_end):
+            start = gap_start[k] if gap_start[k] > release else release
+            end = start + duration
+            if end <= gap_end[k]:
+                # 切分空闲区间：保留左右两段中长度大于0的部分
+                pieces_start, pieces_end = [], []
+                if start > gap_start[k]:
+                    pieces_start.append(gap_start[k])
+                    pieces_end.append(start)
+                if end < gap_end[k]:
+                    pieces_start.append(end)
+                    pieces_end.append(gap_end[k])
+                gap_start[k:k + 1] = pieces_start
+                gap_end[k:k + 1] = pieces_end
+                if len(gap_end) > self.LINEAR_LIMIT:
+                    self._build()
+                return start
+            k += 1
+        return None
+
+
+def _insert_into_gap(gaps, t_mac, ma, release, duration):
+    """
+    在机器ma上为一道工序找最早的可行开始时间，并更新空闲区间索引
+
+    Args:
+        gaps: 该机器的空闲区间（_IdleIntervals）
+        t_mac: 各机器最后一道工序的完成时间
+        ma: 机器索引
+        release: 工序的最早开始时间（同工件上一道工序的完成时间）
+        duration: 加工时间
+
+    Returns:
+        开始时间
+    """
+    start = gaps.occupy(release, duration)
+    if start is not None:
+        return start
+
+    # 没有合适的空闲区间，排在机器末尾，中间的等待成为新的空闲区间
+    start = t_mac[ma] if t_mac[ma] > release else release
+    if start > t_mac[ma]:
+        gaps.add(t_mac[ma], start)
+    t_mac[ma] = start + duration
+    return start
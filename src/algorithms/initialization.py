@@ -1,21 +1,21 @@
 import numpy as np
 
 class Initialization:
-    def __init__(self, work, Tmachinetime):
-        self.work = work
-        self.Tmachinetime = Tmachinetime
+    def __init__(self, instance):
+        """
+        Args:
+            instance: 编译后的算例（src.utils.instance.Instance）
+        """
+        self.instance = instance
 
     def creat(self):
-        OS = np.copy(self.work)
+        inst = self.instance
+        OS = inst.op_job + 1
         np.random.shuffle(OS)
         OS = OS.tolist()
-        MS = []
-        
-        for i in range(len(OS)):
-            P = self.Tmachinetime[i]
-            n_machine = [P[j] for j in range(0, len(P), 2)]
-            index = np.random.randint(0, len(n_machine), 1)
-            selected_machine = n_machine[index[0]]
-            MS.append(selected_machine)
+
+        # 每道工序在其可选机器（CSR）中随机选一台
+        choice = np.random.randint(0, inst.n_eligible)
+        MS = inst.mach_idx[inst.mach_ptr[:-1] + choice].tolist()
                 
-        return OS, MS
\ No newline at end of file
+        return OS, MS
@@ -0,0 +1,409 @@
+'''
+岛屿模型 NSGA-II
+
+K 个独立的 ga 种群分别运行在各自的进程中（各自的随机数流，可使用不同的交叉/变异概率），
+每隔若干代把第一前沿中拥挤度最大的个体发给相邻岛屿。拓扑支持环形(ring)和全连接(full)；
+传输方式支持本机管道(pipe)和 TCP(tcp)，TCP 方式下岛屿可以分布在多台机器上：
+驱动进程以 launch=False 只监听结果，各机器上用 IslandModel.tcp_spec(i) 导出的配置启动岛屿
+
+    ISLAND_AUTHKEY=<十六进制密钥> python -m src.algorithms.island island_0.json
+'''
+import ipaddress
+import json
+import multiprocessing as mp
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Listener, wait
+import numpy as np
+import src.utils.data as da
+from src.algorithms.decode import decode
+from src.algorithms.GA import ga
+from src.algorithms.sorting import fast_non_dominated_sort
+
+_DONE = 'done'  # 岛屿结束时发给邻居的消息，邻居据此停止接收
+
+
+def topology_edges(n_islands, topology='ring'):
+    """
+    Returns:
+        有向边列表 [(发送岛, 接收岛), ...]
+    """
+    if n_islands < 2:
+        return []
+    if topology == 'ring':
+        return [(i, (i + 1) % n_islands) for i in range(n_islands)]
+    if topology == 'full':
+        return [(i, j) for i in range(n_islands) for j in range(n_islands) if i != j]
+    raise ValueError(f'未知的拓扑结构: {topology}')
+
+
+class Migrator:
+    """
+    迁移器：每 interval 代向所有出边发送迁出个体，并非阻塞地接收入边上已到达的个体
+    """
+
+    def __init__(self, island_id, outgoing, incoming, interval, n_migrants):
+        """
+        Args:
+            island_id: 岛屿编号
+            outgoing: 发往邻居的连接列表（multiprocessing Connection）
+            incoming: 来自邻居的连接列表
+            interval: 迁移间隔（代）
+            n_migrants: 每次迁出的个体数
+        """
+        self.island_id = island_id
+        self.outgoing, self.incoming = outgoing, incoming
+        self.interval, self.n_migrants = interval, n_migrants
+        self.sent = self.received = 0
+        self._finished = set()  # 已发来结束消息的入边
+
+    def exchange(self, h, generation):
+        """ga.total 每代调用一次"""
+        if generation % self.interval == 0:
+            job, machine, objectives = h.emigrants(self.n_migrants)
+            for conn in self.outgoing:
+                conn.send((self.island_id, generation, job, machine, objectives))
+            self.sent += len(job)
+
+        arrived = self._drain()
+        if arrived:
+            h.immigrate(np.vstack([m[2] for m in arrived]), np.vstack([m[3] for m in arrived]),
+                        np.vstack([m[4] for m in arrived]))
+            self.received += sum(len(m[2]) for m in arrived)
+
+    def _drain(self):
+        messages = []
+        for k, conn in enumerate(self.incoming):
+            while k not in self._finished and conn.poll():
+                try:
+                    message = conn.recv()
+                except EOFError:
+                    # 邻居异常退出，连接已关闭
+                    self._finished.add(k)
+                    break
+                if isinstance(message, str) and message == _DONE:
+                    self._finished.add(k)
+                else:
+                    messages.append(message)
+        return messages
+
+    def finish(self):
+        """通知邻居本岛结束，并持续接收直到所有入边邻居也结束，避免对方因缓冲区满而阻塞"""
+        for conn in self.outgoing:
+            conn.send(_DONE)
+        pending = [conn for k, conn in enumerate(self.incoming) if k not in self._finished]
+        while pending:
+            for conn in wait(pending):
+                try:
+                    message = conn.recv()
+                except EOFError:
+                    pending.remove(conn)
+                    continue
+                if isinstance(message, str) and message == _DONE:
+                    pending.remove(conn)
+
+
+def run_island(island_id, config, outgoing, incoming, result_conn):
+    """
+    运行一个岛屿，结束后把外部存档中的非支配解 (目标值, 工序编码, 机器编码) 发回驱动进程
+
+    Args:
+        island_id: 岛屿编号
+        config: 岛屿配置字典，见 IslandModel
+        outgoing, incoming: 与邻居岛屿的连接列表
+        result_conn: 发送结果的连接
+    """
+    seed = config['seed']
+    random.seed(seed)
+    np.random.seed(seed)
+
+    instance = da.load(config['da_'], config['a'])
+    de = decode(None, None, instance=instance, mode=config.get('decode_mode', 'semi-active'))
+    h = ga(config['generation'], config['pop_size'], config['cr'], config['mu'], None, de)
+    if config.get('time_limit'):
+        h.set_time_limit(config['time_limit'])
+    h.migrator = Migrator(island_id, outgoing, incoming, config['migration_interval'], config['n_migrants'])
+
+    h.total(instance.n_ops)
+    h.migrator.finish()
+
+    job, machine = h.archive.genomes()
+    result_conn.send((island_id, h.archive.objectives, job, machine,
+                      {'sent': h.migrator.sent, 'received': h.migrator.received}))
+    result_conn.close()
+
+
+def _run_pipe_island(island_id, config, outgoing, incoming, result_conn, unused):
+    """管道传输方式的岛屿入口：先关闭 fork 时继承的其他岛屿的管道端，邻居退出时本岛才能收到 EOF"""
+    for conn in unused:
+        conn.close()
+    run_island(island_id, config, outgoing, incoming, result_conn)
+
+
+def run_tcp_island(island_id, config, listen_address, out_addresses, in_degree, result_address, authkey):
+    """
+    TCP 传输方式的岛屿入口，可在任意一台机器上运行
+
+    Args:
+        island_id: 岛屿编号
+        config: 岛屿配置字典
+        listen_address: 本岛监听地址 (host, port)，接收邻居的迁移个体
+        out_addresses: 出边邻居的监听地址列表
+        in_degree: 入边数量
+        result_address: 驱动进程接收结果的地址
+        authkey: 连接认证密钥（bytes）
+    """
+    listener = Listener(listen_address, backlog=max(in_degree, 1), authkey=authkey)
+    incoming = []
+    # 接收连接放在后台线程，避免互相连接的岛屿彼此等待
+    acceptor = threading.Thread(target=lambda: incoming.extend(listener.accept() for _ in range(in_degree)))
+    acceptor.start()
+    outgoing = [_connect(address, authkey) for address in out_addresses]
+    acceptor.join()
+
+    result_conn = _connect(result_address, authkey)
+    try:
+        run_island(island_id, config, outgoing, incoming, result_conn)
+    finally:
+        listener.close()
+
+
+def _connect(address, authkey, timeout=30.0):
+    """连接到 address，对方尚未开始监听时重试"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return Client(address, authkey=authkey)
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def _is_loopback(host):
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class IslandModel:
+    """
+    岛屿模型驱动：启动各岛屿进程，收集各岛外部存档中的非支配解并用非支配排序合并
+    """
+
+    def __init__(self, da_, a, n_islands, generation, pop_size, cr, mu, topology='ring',
+                 migration_interval=10, n_migrants=2, transport='pipe', seed=0, island_configs=None,
+                 time_limit=None, decode_mode='semi-active', host='127.0.0.1', base_port=6100, authkey=None,
+                 addresses=None, result_address=None, launch=True):
+        """
+        Args:
+            da_, a: 数据源和算例名（各岛屿自行读取）
+            n_islands: 岛屿数K
+            generation, pop_size, cr, mu: 每个岛屿的 ga 参数
+            topology: 'ring' 或 'full'
+            migration_interval: 迁移间隔（代）
+            n_migrants: 每次迁出个体数
+            transport: 'pipe'（本机）或 'tcp'
+            seed: 主随机种子，各岛屿的种子由它派生
+            island_configs: 长度为K的字典列表，覆盖单个岛屿的参数（如 cr、mu）
+            time_limit: 每个岛屿的时间限制（秒）
+            decode_mode: 解码模式
+            host, base_port: TCP 方式下默认的地址：岛屿 i 监听 (host, base_port + i)，结果汇总到 (host, base_port + K)
+            authkey: TCP 连接认证密钥（bytes）。连接上收到的消息会被反序列化，任一地址不是本机回环地址
+                     或 launch=False 时必须显式给出；全部在本机时为 None 则随机生成
+            addresses: 长度为K的各岛屿监听地址 [(host, port), ...]，覆盖 host/base_port
+            result_address: 驱动进程接收结果的地址，覆盖 (host, base_port + K)
+            launch: TCP 方式下是否由驱动进程在本机启动全部岛屿；False 时只监听结果，
+                    岛屿用 tcp_spec(i) 的配置在各自的机器上启动
+        """
+        self.n_islands = n_islands
+        self.topology = topology
+        self.transport = transport
+        self.launch = launch
+        self.addresses = [tuple(address) for address in addresses] if addresses is not None else \
+            [(host, base_port + i) for i in range(n_islands)]
+        if len(self.addresses) != n_islands:
+            raise ValueError('addresses 的长度必须等于岛屿数')
+        self.result_address = tuple(result_address) if result_address is not None else (host, base_port + n_islands)
+        if authkey is None and transport == 'tcp':
+            if not launch or not all(_is_loopback(h) for h, _ in self.addresses + [self.result_address]):
+                raise ValueError('岛屿不全在本机回环地址上或 launch=False 时必须显式给出 authkey')
+            authkey = os.urandom(32)
+        self.authkey = authkey
+        seeds = np.random.SeedSequence(seed).generate_state(n_islands).tolist()
+        self.configs = []
+        for i in range(n_islands):
+            config = {'da_': da_, 'a': a, 'generation': generation, 'pop_size': pop_size, 'cr': cr, 'mu': mu,
+                      'migration_interval': migration_interval, 'n_migrants': n_migrants, 'seed': seeds[i],
+                      'time_limit': time_limit, 'decode_mode': decode_mode}
+            if island_configs is not None:
+                config.update(island_configs[i])
+            self.configs.append(config)
+        self.stats = []
+
+    def run(self):
+        """
+        Returns:
+            (final_pareto_solutions, best_individual)，格式与 ga.total 相同
+        """
+        if self.transport == 'pipe':
+            results = self._run_pipe()
+        elif self.transport == 'tcp':
+            results = self._run_tcp()
+        else:
+            raise ValueError(f'未知的传输方式: {self.transport}')
+        return self._merge(results)
+
+    def _run_pipe(self):
+        K = self.n_islands
+        outgoing, incoming = [[] for _ in range(K)], [[] for _ in range(K)]
+        for i, j in topology_edges(K, self.topology):
+            receiver, sender = mp.Pipe(duplex=False)
+            outgoing[i].append(sender)
+            incoming[j].append(receiver)
+        result_pipes = [mp.Pipe(duplex=False) for _ in range(K)]
+        ends = [conn for conns in outgoing + incoming for conn in conns] + [conn for pipe in result_pipes for conn in pipe]
+
+        processes = []
+        for i in range(K):
+            own = outgoing[i] + incoming[i] + [result_pipes[i][1]]
+            unused = [conn for conn in ends if all(conn is not c for c in own)]
+            process = mp.Process(target=_run_pipe_island,
+                                 args=(i, self.configs[i], outgoing[i], incoming[i], result_pipes[i][1], unused))
+            process.start()
+            processes.append(process)
+        # 驱动进程只保留结果管道的接收端，否则岛屿退出后各管道仍有写端打开，永远收不到 EOF
+        for conn in ends:
+            if all(conn is not receiver for receiver, _ in result_pipes):
+                conn.close()
+        receivers = {receiver: i for i, (receiver, _) in enumerate(result_pipes)}
+        return self._collect(processes, receivers, K)
+
+    @staticmethod
+    def _collect(processes, receivers, expected, accept=None):
+        """
+        等待各岛屿的结果，同时监视本机启动的岛屿进程；岛屿以非零状态退出或未发回结果就断开时终止其余岛屿并报错
+
+        Args:
+            processes: 本机启动的岛屿进程列表
+            receivers: {结果连接: 岛屿编号}
+            expected: 结果个数
+            accept: TCP 方式下取出后台线程新接受的结果连接的函数，None 表示 receivers 已齐全
+
+        Returns:
+            各岛屿发回的结果列表
+        """
+        results = []
+        sentinels = {process.sentinel: process for process in processes}
+        try:
+            while len(results) < expected:
+                if accept is not None:
+                    receivers.update((conn, None) for conn in accept())
+                # 后台线程接受连接时不能无限期等待，按间隔重新取出新连接
+                ready = wait(list(receivers) + list(sentinels), timeout=None if accept is None else 0.1)
+                for obj in ready:
+                    if obj in sentinels:
+                        process = sentinels.pop(obj)
+                        process.join()
+                        if process.exitcode != 0:
+                            raise RuntimeError(f'岛屿进程 {process.name} 异常退出（exitcode={process.exitcode}）')
+                        continue
+                    try:
+                        results.append(obj.recv())
+                    except EOFError:
+                        island = receivers[obj]
+                        raise RuntimeError('岛屿未发回结果就断开了连接' if island is None else
+                                           f'岛屿 {island} 未发回结果就断开了连接') from None
+                    del receivers[obj]
+                    obj.close()
+        except BaseException:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            raise
+        finally:
+            for conn in receivers:
+                conn.close()
+            for process in processes:
+                process.join()
+        return results
+
+    def tcp_spec(self, i):
+        """
+        岛屿 i 的 TCP 启动配置（可写成 JSON 交给 python -m src.algorithms.island，不含 authkey）
+
+        Returns:
+            字典：run_tcp_island 除 authkey 外的参数
+        """
+        edges = topology_edges(self.n_islands, self.topology)
+        return {'island_id': i, 'config': self.configs[i], 'listen_address': self.addresses[i],
+                'out_addresses': [self.addresses[j] for s, j in edges if s == i],
+                'in_degree': sum(1 for _, j in edges if j == i), 'result_address': self.result_address}
+
+    def _run_tcp(self):
+        K = self.n_islands
+        result_listener = Listener(self.result_address, backlog=K, authkey=self.authkey)
+        processes = []
+        if self.launch:
+            for i in range(K):
+                process = mp.Process(target=run_tcp_island, kwargs=dict(self.tcp_spec(i), authkey=self.authkey))
+                process.start()
+                processes.append(process)
+        # 结果连接在后台线程中接受：带认证的 Client 要等对方 accept 完成握手才返回，
+        # 逐个 accept 再 recv 会让其余岛屿卡在连接阶段，进而使邻居在 finish() 中互相等待；
+        # 岛屿异常退出时主线程报错返回，仍阻塞在 accept 的守护线程随进程结束
+        accepted = queue.Queue()
+
+        def acceptor():
+            try:
+                for _ in range(K):
+                    accepted.put(result_listener.accept())
+            except OSError:
+                pass
+
+        threading.Thread(target=acceptor, daemon=True).start()
+
+        def take():
+            conns = []
+            while not accepted.empty():
+                conns.append(accepted.get())
+            return conns
+
+        try:
+            return self._collect(processes, {}, K, take)
+        finally:
+            result_listener.close()
+
+    def _merge(self, results):
+        results = sorted(results, key=lambda r: r[0])
+        self.stats = [r[4] for r in results]
+        objectives = np.vstack([r[1] for r in results])
+        job = np.vstack([r[2] for r in results])
+        machine = np.vstack([r[3] for r in results])
+
+        front = fast_non_dominated_sort(objectives)[0]
+        # 去重并按完工时间排序
+        _, unique = np.unique(objectives[front], axis=0, return_index=True)
+        front = np.asarray(front)[unique]
+        front = front[np.lexsort((objectives[front, 1], objectives[front, 0]))]
+
+        best = front[0]
+        best_individual = {'OS': job[best].tolist(), 'MS': machine[best].tolist()}
+        return objectives[front].tolist(), best_individual
+
+
+if __name__ == '__main__':
+    # 在本机运行一个 TCP 岛屿：参数为 IslandModel.tcp_spec(i) 导出的 JSON 文件，密钥取自环境变量 ISLAND_AUTHKEY
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+    spec['listen_address'] = tuple(spec['listen_address'])
+    spec['out_addresses'] = [tuple(address) for address in spec['out_addresses']]
+    spec['result_address'] = tuple(spec['result_address'])
+    run_tcp_island(authkey=bytes.fromhex(os.environ['ISLAND_AUTHKEY']), **spec)
@@ -0,0 +1,294 @@
+import time
+import numpy as np
+from src.algorithms.selection import dominates
+
+
+class ScheduleGraph:
+    """
+    调度的析取图视图
+
+    由 OS/MS 得到每台机器上的加工顺序，再按拓扑序计算每道工序的
+    头长 r（最早开始时间）和尾长 q（完工后到调度结束的最长路径，不含自身加工时间），
+    r[v] + p[v] + q[v] == makespan 的工序位于关键路径上。
+
+    不给出 start_times 时机器上的顺序即OS顺序（半主动调度）；主动解码会把工序插到更早的空闲区间，
+    此时传入解码得到的开始时间，按开始时间排出各机器上的顺序，图描述的才是解码器实际产生的调度。
+    """
+
+    def __init__(self, instance, OS, MS, proc_time=None, start_times=None):
+        """
+        Args:
+            instance: 编译后的算例（src.utils.instance.Instance）
+            OS: 工序编码
+            MS: 机器编码
+            proc_time: instance.proc_time.tolist() 的结果，反复建图时传入以免重复转换
+            start_times: 每道工序的开始时间（decode.start_times），None 时按OS顺序
+        """
+        self.instance = instance
+        OS = OS.tolist() if isinstance(OS, np.ndarray) else list(OS)
+        MS = MS.tolist() if isinstance(MS, np.ndarray) else list(MS)
+        self._proc_time = proc_time if proc_time is not None else instance.proc_time.tolist()
+        op_job = instance.op_job.tolist()
+        job_start = instance.job_start.tolist()
+        n = instance.n_ops
+        self.op_job = op_job
+
+        self.machine = [m - 1 for m in MS]
+        self.p = [self._proc_time[v][self.machine[v]] for v in range(n)]
+        self.job_pred = [v - 1 if v > job_start[op_job[v]] else -1 for v in range(n)]
+        self.job_succ = [v + 1 if v + 1 < job_start[op_job[v] + 1] else -1 for v in range(n)]
+
+        # 按OS顺序得到各机器上的加工序列，OS顺序本身就是一个拓扑序
+        count = [0] * instance.n_jobs
+        topo = []
+        for gene in OS:
+            j = gene - 1
+            topo.append(job_start[j] + count[j])
+            count[j] += 1
+        if start_times is not None:
+            # 加工时间为正，按开始时间（相同时按OS位置）排序仍是拓扑序
+            topo.sort(key=start_times.__getitem__)
+        self.sequences = [[] for _ in range(instance.n_machines)]
+        for v in topo:
+            self.sequences[self.machine[v]].append(v)
+        self._evaluate(topo)
+
+    def _evaluate(self, topo):
+        """根据机器序列和拓扑序计算机器前驱/后继、头长、尾长和完工时间"""
+        n = len(self.p)
+        self.topo = topo
+        self.mach_pred, self.mach_succ = [-1] * n, [-1] * n
+        for seq in self.sequences:
+            for a, b in zip(seq, seq[1:]):
+                self.mach_succ[a] = b
+                self.mach_pred[b] = a
+
+        p, jp, mp, js, ms = self.p, self.job_pred, self.mach_pred, self.job_succ, self.mach_succ
+        r, q = [0] * n, [0] * n
+        for v in topo:
+            head = r[jp[v]] + p[jp[v]] if jp[v] >= 0 else 0
+            if mp[v] >= 0 and r[mp[v]] + p[mp[v]] > head:
+                head = r[mp[v]] + p[mp[v]]
+            r[v] = head
+        for v in reversed(topo):
+            tail = q[js[v]] + p[js[v]] if js[v] >= 0 else 0
+            if ms[v] >= 0 and q[ms[v]] + p[ms[v]] > tail:
+                tail = q[ms[v]] + p[ms[v]]
+            q[v] = tail
+        self.r, self.q = r, q
+        self.makespan = max(r[v] + p[v] for v in range(n))
+
+    def processing_time(self, v, k):
+        """工序 v 在机器 k（从0开始）上的加工时间"""
+        return self._proc_time[v][k]
+
+    def critical_blocks(self):
+        """
+        取一条关键路径并切分为关键块（路径上同一机器的连续工序）
+
+        Returns:
+            关键块列表，按路径顺序排列，每块为工序索引列表
+        """
+        r, p, jp, mp = self.r, self.p, self.job_pred, self.mach_pred
+        v = max(range(len(p)), key=lambda u: r[u] + p[u])
+        path = [v]
+        while r[v] > 0:
+            # 优先沿机器弧回溯，使关键块尽量长
+            if mp[v] >= 0 and r[mp[v]] + p[mp[v]] == r[v]:
+                v = mp[v]
+            else:
+                v = jp[v]
+            path.append(v)
+        path.reverse()
+
+        blocks = [[path[0]]]
+        for u in path[1:]:
+            if self.machine[u] == self.machine[blocks[-1][-1]] and self.mach_pred[u] == blocks[-1][-1]:
+                blocks[-1].append(u)
+            else:
+                blocks.append([u])
+        return blocks
+
+    def estimate_swap(self, u, v):
+        """
+        交换同一机器上相邻工序 u、v（u在前）后完工时间的估计值（Balas & Vazacopoulos 近似）
+        """
+        r, q, p = self.r, self.q, self.p
+        jp, js = self.job_pred, self.job_succ
+        before, after = self.mach_pred[u], self.mach_succ[v]
+        head_v = max(r[jp[v]] + p[jp[v]] if jp[v] >= 0 else 0, r[before] + p[before] if before >= 0 else 0)
+        head_u = max(r[jp[u]] + p[jp[u]] if jp[u] >= 0 else 0, head_v + p[v])
+        tail_u = max(q[js[u]] + p[js[u]] if js[u] >= 0 else 0, q[after] + p[after] if after >= 0 else 0)
+        tail_v = max(q[js[v]] + p[js[v]] if js[v] >= 0 else 0, tail_u + p[u])
+        return max(head_v + p[v] + tail_v, head_u + p[u] + tail_u)
+
+    def estimate_reassign(self, v, k):
+        """
+        把工序 v 移到机器 k 上时完工时间的估计值及最佳插入位置
+
+        Returns:
+            (估计值, 在机器k序列中的插入位置)
+        """
+        r, q, p = self.r, self.q, self.p
+        jp, js = self.job_pred, self.job_succ
+        p_new = self.processing_time(v, k)
+        release = r[jp[v]] + p[jp[v]] if jp[v] >= 0 else 0
+        tail = q[js[v]] + p[js[v]] if js[v] >= 0 else 0
+        seq = self.sequences[k]
+        best, best_pos = None, 0
+        for pos in range(len(seq) + 1):
+            head = release
+            if pos > 0 and r[seq[pos - 1]] + p[seq[pos - 1]] > head:
+                head = r[seq[pos - 1]] + p[seq[pos - 1]]
+            rest = tail
+            if pos < len(seq) and p[seq[pos]] + q[seq[pos]] > rest:
+                rest = p[seq[pos]] + q[seq[pos]]
+            estimate = head + p_new + rest
+            if best is None or estimate < best:
+                best, best_pos = estimate, pos
+        return best, best_pos
+
+    def moves(self):
+        """
+        关键块上的候选邻域动作，按估计完工时间升序
+
+        - ('swap', u, v)：N5 邻域，交换关键块首两道或末两道工序（首块不换头、末块不换尾）
+        - ('reassign', v, k, pos)：把关键工序 v 移到另一台可选机器 k 的第 pos 个位置
+
+        Returns:
+            [(估计值, 动作), ...]
+        """
+        blocks = self.critical_blocks()
+        candidates = []
+        for b, block in enumerate(blocks):
+            if len(block) < 2:
+                continue
+            pairs = set()
+            if b > 0:
+                pairs.add((block[0], block[1]))
+            if b < len(blocks) - 1:
+                pairs.add((block[-2], block[-1]))
+            for u, v in pairs:
+                candidates.append((self.estimate_swap(u, v), ('swap', u, v)))
+        for block in blocks:
+            for v in block:
+                for k in self.instance.eligible_machines(v).tolist():
+                    if k - 1 != self.machine[v]:
+                        estimate, pos = self.estimate_reassign(v, k - 1)
+                        candidates.append((estimate, ('reassign', v, k - 1, pos)))
+        candidates.sort(key=lambda c: c[0])
+        return candidates
+
+    def apply(self, move):
+        """
+        生成执行动作后的编码（不修改当前图）
+
+        Returns:
+            (OS, MS)；动作使析取图出现环时返回 None
+        """
+        sequences = [list(seq) for seq in self.sequences]
+        machine = list(self.machine)
+        if move[0] == 'swap':
+            _, u, v = move
+            seq = sequences[machine[u]]
+            i = seq.index(u)
+            seq[i], seq[i + 1] = v, u
+        else:
+            _, v, k, pos = move
+            sequences[machine[v]].remove(v)
+            sequences[k].insert(pos, v)
+            machine[v] = k
+
+        topo = self._topological_order(sequences)
+        if topo is None:
+            return None
+        OS = [self.op_job[v] + 1 for v in topo]
+        MS = [m + 1 for m in machine]
+        return OS, MS
+
+    def _topological_order(self, sequences):
+        """Kahn 算法求工件弧 + 机器弧的拓扑序，有环时返回 None"""
+        n = len(self.p)
+        succ = [[] for _ in range(n)]
+        indegree = [0] * n
+        for v in range(n):
+            if self.job_succ[v] >= 0:
+                succ[v].append(self.job_succ[v])
+                indegree[self.job_succ[v]] += 1
+        for seq in sequences:
+            for a, b in zip(seq, seq[1:]):
+                succ[a].append(b)
+                indegree[b] += 1
+        ready = [v for v in range(n) if indegree[v] == 0]
+        topo = []
+        while ready:
+            v = ready.pop()
+            topo.append(v)
+            for w in succ[v]:
+                indegree[w] -= 1
+                if indegree[w] == 0:
+                    ready.append(w)
+        return topo if len(topo) == n else None
+
+
+class LocalSearch:
+    """
+    关键块局部搜索
+
+    用析取图估计每个动作的完工时间，只把有希望的动作重新解码；接受支配当前解的第一个动作（首次改进）。
+    主动解码时按解码得到的开始时间建图，每轮多一次解码，同样计入 evaluations。
+    """
+
+    def __init__(self, de):
+        """
+        Args:
+            de: 解码器（decode），用于对被选中的动作做精确评估
+        """
+        self.de = de
+        self.evaluations = 0
+        self._proc_time = de.instance.proc_time.tolist()
+        self._active = de.mode != 'semi-active'
+
+    def improve(self, OS, MS, objectives, deadline):
+        """
+        在时间期限内反复改进一个解
+
+        Args:
+            OS: 工序编码
+            MS: 机器编码
+            objectives: 当前目标值 [C_max, TEC]
+            deadline: time.perf_counter() 的截止时间
+
+        Returns:
+            (OS, MS, objectives, 是否改进)
+        """
+        improved = False
+        while time.perf_counter() < deadline:
+            start_times = None
+            if self._active:
+                _, start_times = self.de.start_times(OS, MS)
+                self.evaluations += 1
+            graph = ScheduleGraph(self.de.instance, OS, MS, self._proc_time, start_times)
+            accepted = None
+            for estimate, move in graph.moves():
+                # 交换只改变顺序，需估计完工时间下降；换机器还可能降低加工能耗，允许完工时间估计持平
+                if estimate > graph.makespan:
+                    break
+                if estimate == graph.makespan and (move[0] == 'swap' or
+                                                   graph.processing_time(move[1], move[2]) >= graph.p[move[1]]):
+                    continue
+                candidate = graph.apply(move)
+                if candidate is None:
+                    continue
+                candidate_obj = self.de.caculate(*candidate)
+                self.evaluations += 1
+                if dominates(candidate_obj, objectives):
+                    accepted = candidate, candidate_obj
+                    break
+                if time.perf_counter() >= deadline:
+                    break
+            if accepted is None:
+                break
+            (OS, MS), objectives = accepted
+            improved = True
+        return OS, MS, objectives, improved
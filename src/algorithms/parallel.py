@@ -0,0 +1,127 @@
+import multiprocessing as mp
+import time
+import numpy as np
+
+_worker_decoder = None  # 每个工作进程持有的解码器，启动时设置一次
+
+
+def _init_worker(de):
+    """工作进程初始化：fork 时直接继承父进程中的解码器，spawn 时只在启动时传输一次"""
+    global _worker_decoder
+    _worker_decoder = de
+
+
+def _evaluate_chunk(chunk):
+    OS_chunk, MS_chunk, bound = chunk
+    return _worker_decoder.caculate_batch(OS_chunk, MS_chunk, bound)
+
+
+def _evaluate_chunk_timed(chunk):
+    start = time.process_time()
+    objectives = _evaluate_chunk(chunk)
+    return objectives, time.process_time() - start
+
+
+class ParallelEvaluator:
+    """
+    进程池适应度评估
+
+    常驻进程池，算例数据只在工作进程启动时传输一次；每次评估把子代按行切块，
+    以紧凑的整数数组发送给工作进程，按块顺序拼回结果，与串行批量解码结果完全一致。
+    """
+
+    def __init__(self, de, workers, chunksize=None):
+        """
+        Args:
+            de: 解码器（decode）
+            workers: 工作进程数
+            chunksize: 每块个体数，None 表示平均分给所有工作进程
+        """
+        self.de = de
+        self.workers = workers
+        self.chunksize = chunksize
+        self.cpu_time = 0.0  # 工作进程累计的解码CPU时间（秒），用于CPU时间预算
+        methods = mp.get_all_start_methods()
+        ctx = mp.get_context('fork' if 'fork' in methods else None)
+        self.pool = ctx.Pool(workers, initializer=_init_worker, initargs=(de,))
+
+    def _chunks(self, OS_matrix, MS_matrix, chunksize, bound=None):
+        P = len(OS_matrix)
+        if chunksize is None:
+            chunksize = -(-P // self.workers)
+        dtype = np.uint16 if max(self.de.instance.n_jobs, self.de.instance.n_machines) < 2 ** 16 else np.int32
+        OS_matrix = np.asarray(OS_matrix, dtype=dtype)
+        MS_matrix = np.asarray(MS_matrix, dtype=dtype)
+        return [(OS_matrix[i:i + chunksize], MS_matrix[i:i + chunksize], bound) for i in range(0, P, max(chunksize, 1))]
+
+    def evaluate(self, OS_matrix, MS_matrix, chunksize=None, bound=None):
+        """
+        并行批量解码
+
+        Args:
+            OS_matrix: (P, n) 工序编码矩阵
+            MS_matrix: (P, n) 机器编码矩阵
+            chunksize: 覆盖构造时的分块大小
+            bound: 支配界，见 decode.caculate_batch
+
+        Returns:
+            (P, 2) 目标值数组
+        """
+        if len(OS_matrix) == 0:
+            return np.zeros((0, 2))
+        chunks = self._chunks(OS_matrix, MS_matrix, chunksize or self.chunksize, bound)
+        results = self.pool.map(_evaluate_chunk_timed, chunks, chunksize=1)
+        self.cpu_time += sum(busy for _, busy in results)
+        return np.vstack([objectives for objectives, _ in results])
+
+    def submit(self, OS_matrix, MS_matrix, callback, error_callback=None):
+        """
+        异步评估一小批个体，立即返回
+
+        Args:
+            OS_matrix: (k, n) 工序编码矩阵
+            MS_matrix: (k, n) 机器编码矩阵
+            callback: 完成回调 callback(目标值数组)，在进程池的结果线程中调用
+            error_callback: 解码出错时的回调 error_callback(异常)
+        """
+        def finished(result):
+            objectives, busy = result
+            self.cpu_time += busy
+            callback(objectives)
+
+        chunk = self._chunks(OS_matrix, MS_matrix, len(OS_matrix))[0]
+        return self.pool.apply_async(_evaluate_chunk_timed, (chunk,), callback=finished, error_callback=error_callback)
+
+    def speedup(self, OS_matrix, MS_matrix, chunksizes=(None,), repeat=3):
+        """
+        测量不同分块大小相对串行批量解码的加速比，用于为不同规模的算例选择分块大小
+
+        Args:
+            OS_matrix: (P, n) 工序编码矩阵
+            MS_matrix: (P, n) 机器编码矩阵
+            chunksizes: 待测试的分块大小
+            repeat: 重复次数，取最短时间
+
+        Returns:
+            列表，每项为 {'chunksize', 'serial', 'parallel', 'speedup'}（时间单位：秒）
+        """
+        serial = min(self._timeit(lambda: self.de.caculate_batch(OS_matrix, MS_matrix)) for _ in range(repeat))
+        report = []
+        for chunksize in chunksizes:
+            parallel = min(self._timeit(lambda: self.evaluate(OS_matrix, MS_matrix, chunksize)) for _ in range(repeat))
+            report.append({'chunksize': chunksize, 'serial': serial, 'parallel': parallel,
+                           'speedup': serial / parallel if parallel > 0 else float('inf')})
+        return report
+
+    @staticmethod
+    def _timeit(func):
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+
+    def close(self):
+        """关闭进程池"""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+class Population:
+    """
+    种群容器
+
+    预分配 (2P, n) 的工序/机器编码缓冲区和 (2P, M) 的目标值缓冲区：前P行为父代，后P行为子代，
+    整块即为环境选择时的合并种群。各阶段都通过视图读写，迭代过程中不再创建新的种群数组。
+    """
+
+    def __init__(self, pop_size, job_length, n_objectives=2, max_gene=None):
+        """
+        Args:
+            pop_size: 种群规模P
+            job_length: 编码长度n（总工序数）
+            n_objectives: 目标数M
+            max_gene: 编码中的最大值（工件数、机器数的较大者），用于选择紧凑的整数类型
+        """
+        self.pop_size = pop_size
+        dtype = np.uint16 if max_gene is not None and max_gene < 2 ** 16 else np.int32
+
+        self.job = np.zeros((2 * pop_size, job_length), dtype=dtype)
+        self.machine = np.zeros((2 * pop_size, job_length), dtype=dtype)
+        self.objectives = np.zeros((2 * pop_size, n_objectives))
+        self.rank = np.zeros(2 * pop_size, dtype=np.int64)
+        self.crowding = np.zeros(2 * pop_size)
+
+        # 环境选择时收集幸存者的临时缓冲区
+        self._job_tmp = np.zeros((pop_size, job_length), dtype=dtype)
+        self._machine_tmp = np.zeros((pop_size, job_length), dtype=dtype)
+        self._objectives_tmp = np.zeros((pop_size, n_objectives))
+        self._rank_tmp = np.zeros(pop_size, dtype=np.int64)
+        self._crowding_tmp = np.zeros(pop_size)
+
+    @property
+    def parent_job(self):
+        return self.job[:self.pop_size]
+
+    @property
+    def parent_machine(self):
+        return self.machine[:self.pop_size]
+
+    @property
+    def parent_objectives(self):
+        return self.objectives[:self.pop_size]
+
+    @property
+    def offspring_job(self):
+        return self.job[self.pop_size:]
+
+    @property
+    def offspring_machine(self):
+        return self.machine[self.pop_size:]
+
+    @property
+    def offspring_objectives(self):
+        return self.objectives[self.pop_size:]
+
+    def survive(self, survivors, rank=None, crowding=None):
+        """
+        将合并种群中的幸存者搬到父代位置
+
+        Args:
+            survivors: 长度为P的合并种群行索引
+            rank: (2P,) 合并种群的等级，可选
+            crowding: (2P,) 合并种群的拥挤度，可选
+        """
+        np.take(self.job, survivors, axis=0, out=self._job_tmp)
+        np.take(self.machine, survivors, axis=0, out=self._machine_tmp)
+        np.take(self.objectives, survivors, axis=0, out=self._objectives_tmp)
+        self.job[:self.pop_size] = self._job_tmp
+        self.machine[:self.pop_size] = self._machine_tmp
+        self.objectives[:self.pop_size] = self._objectives_tmp
+        if rank is not None:
+            np.take(rank, survivors, out=self._rank_tmp)
+            self.rank[:self.pop_size] = self._rank_tmp
+        if crowding is not None:
+            np.take(crowding, survivors, out=self._crowding_tmp)
+            self.crowding[:self.pop_size] = self._crowding_tmp
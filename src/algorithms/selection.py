@@ -1,42 +1,32 @@
 import numpy as np
-import random
 
-def binary_tournament_selection(objectives, population_job, population_machine):
+def binary_tournament_selection(rank, crowding, n_select=None):
     """
-    二元锦标赛选择
+    二元锦标赛选择（拥挤度比较算子）
+
+    一次随机生成所有锦标赛对，等级低者胜；等级相同时拥挤度大者胜。
     
     Args:
-        objectives: 目标函数值列表
-        population_job: 工序编码种群
-        population_machine: 机器编码种群
-        population_time: 时间编码种群
+        rank: (P,) 非支配等级
+        crowding: (P,) 拥挤度距离
+        n_select: 选择的父代数量，默认为P
         
     Returns:
-        选择的父代列表
+        (n_select,) 选中父代在种群中的索引
     """
-    pop_size = len(objectives)
-    selected_parents = []
-    
-    for _ in range(pop_size):
-        # 随机选择两个个体
-        idx1, idx2 = random.sample(range(pop_size), 2)
-        
-        # 比较两个个体的非支配关系
-        if dominates(objectives[idx1], objectives[idx2]):
-            winner = idx1
-        elif dominates(objectives[idx2], objectives[idx1]):
-            winner = idx2
-        else:
-            # 如果两个个体互不支配，随机选择一个
-            winner = random.choice([idx1, idx2])
-        
-        # 添加获胜者到选择列表
-        selected_parents.append((
-            population_job[winner].tolist(),
-            population_machine[winner].tolist()
-        ))
-    
-    return selected_parents
+    rank, crowding = np.asarray(rank), np.asarray(crowding)
+    pop_size = len(rank)
+    n_select = pop_size if n_select is None else n_select
+    if pop_size < 2:
+        return np.zeros(n_select, dtype=np.int64)
+
+    # 每行 (第一个个体, 偏移)，偏移在 [1, P) 内，保证两个个体不同
+    draws = np.random.randint([0, 1], [pop_size, pop_size], size=(n_select, 2))
+    idx1 = draws[:, 0]
+    idx2 = (idx1 + draws[:, 1]) % pop_size
+
+    first_wins = (rank[idx1] < rank[idx2]) | ((rank[idx1] == rank[idx2]) & (crowding[idx1] >= crowding[idx2]))
+    return np.where(first_wins, idx1, idx2)
 
 def dominates(obj1, obj2):
     """
@@ -1,10 +1,111 @@
+from bisect import bisect_left
+import numpy as np
+
+
 def fast_non_dominated_sort(objectives):
     """
     快速非支配排序
-    
+
+    双目标时使用 O(N log N) 的排序-扫描算法，多目标时使用 ENS-BS（高效非支配排序，二分查找）。
+
+    Args:
+        objectives: 目标函数值列表或 (N, M) 数组
+
+    Returns:
+        非支配前沿列表，每个前沿为按升序排列的个体索引列表
+    """
+    F = np.asarray(objectives, dtype=float)
+    if len(F) == 0:
+        return []
+    if F.shape[1] == 2:
+        return _sort_bi_objective(F)
+    return efficient_non_dominated_sort(F)
+
+
+def _sort_bi_objective(F):
+    """
+    双目标非支配排序，O(N log N)
+
+    按 (f1, f2) 字典序扫描：每个前沿中后加入的解 (f2, f1) 单调不增，只需与各前沿最后一个解比较；
+    各前沿最后一个解的 (f2, f1) 随前沿序号单调不减，因此可以二分查找所属前沿。
+    """
+    order = np.lexsort((F[:, 1], F[:, 0]))
+    f1, f2 = F[order, 0].tolist(), F[order, 1].tolist()
+    last_keys = []  # 每个前沿最后一个解的 (f2, f1)
+    fronts = []
+    for pos, i in enumerate(order.tolist()):
+        key = (f2[pos], f1[pos])
+        # 前沿k支配该解 <=> last_keys[k] < key，找到第一个不支配它的前沿
+        k = bisect_left(last_keys, key)
+        if k == len(fronts):
+            fronts.append([i])
+            last_keys.append(key)
+        else:
+            fronts[k].append(i)
+            last_keys[k] = key
+    return [sorted(front) for front in fronts]
+
+
+def efficient_non_dominated_sort(objectives, binary_search=True):
+    """
+    高效非支配排序 ENS（Zhang et al., 2015），适用于任意目标数
+
+    按字典序处理每个解，排在前面的解不可能被后面的解支配，因此每个解只需与已分配的前沿比较。
+
+    Args:
+        objectives: (N, M) 目标值数组
+        binary_search: True 使用 ENS-BS（二分查找前沿），False 使用 ENS-SS（顺序查找）
+
+    Returns:
+        非支配前沿列表，每个前沿为按升序排列的个体索引列表
+    """
+    F = np.asarray(objectives, dtype=float)
+    if len(F) == 0:
+        return []
+    order = np.lexsort(F.T[::-1])
+    fronts = []
+    members = []  # 每个前沿成员的目标值缓冲区（按容量倍增），避免每次比较都重新索引
+    sizes = []
+
+    def dominated_by(k, x):
+        objs = members[k][:sizes[k]]
+        # 字典序在前且各目标不劣的解，只要与x不完全相同就支配x
+        return bool(np.any(np.all(objs <= x, axis=1) & np.any(objs < x, axis=1)))
+
+    for i in order.tolist():
+        x = F[i]
+        if binary_search:
+            lo, hi = 0, len(fronts)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if dominated_by(mid, x):
+                    lo = mid + 1
+                else:
+                    hi = mid
+            k = lo
+        else:
+            k = 0
+            while k < len(fronts) and dominated_by(k, x):
+                k += 1
+        if k == len(fronts):
+            fronts.append([])
+            members.append(np.empty((8, F.shape[1])))
+            sizes.append(0)
+        if sizes[k] == len(members[k]):
+            members[k] = np.concatenate((members[k], np.empty_like(members[k])))
+        fronts[k].append(i)
+        members[k][sizes[k]] = x
+        sizes[k] += 1
+    return [sorted(front) for front in fronts]
+
+
+def naive_non_dominated_sort(objectives):
+    """
+    Deb 原始的 O(M·N²) 快速非支配排序，保留作为基准对照
+
     Args:
         objectives: 目标函数值列表
-        
+
     Returns:
         非支配前沿列表
     """
@@ -41,6 +142,60 @@ def fast_non_dominated_sort(objectives):
     
     return fronts[:-1]  # 最后一个前沿为空，不返回
 
+def fronts_to_rank(fronts, n):
+    """
+    将前沿列表转换为等级数组
+
+    Args:
+        fronts: 非支配前沿列表
+        n: 个体总数
+
+    Returns:
+        (n,) 等级数组，第一前沿为0
+    """
+    rank = np.empty(n, dtype=np.int64)
+    for k, front in enumerate(fronts):
+        rank[front] = k
+    return rank
+
+
+def crowding_distance(objectives, rank):
+    """
+    向量化拥挤度距离：一次计算所有前沿
+
+    Args:
+        objectives: (N, M) 目标值数组
+        rank: (N,) 等级数组
+
+    Returns:
+        (N,) 拥挤度距离，各前沿在每个目标上的边界点为无穷大
+    """
+    F = np.asarray(objectives, dtype=float)
+    rank = np.asarray(rank)
+    n = len(F)
+    distances = np.zeros(n)
+    if n == 0:
+        return distances
+
+    for m in range(F.shape[1]):
+        # 先按等级、再按目标m排序，同一前沿连续排列
+        order = np.lexsort((F[:, m], rank))
+        r, f = rank[order], F[order, m]
+        first = np.r_[True, r[1:] != r[:-1]]   # 每个前沿在目标m上的最小点
+        last = np.r_[r[1:] != r[:-1], True]    # 每个前沿在目标m上的最大点
+        segment = np.cumsum(first) - 1
+        # 被剪枝的子代目标值为 inf，只含这类点的前沿 span 为 nan，不产生内部点
+        with np.errstate(invalid='ignore'):
+            span = (f[last] - f[first])[segment]
+            interior = ~(first | last) & (span > 0)
+            contribution = np.zeros(n)
+            contribution[interior] = (f[2:] - f[:-2])[interior[1:-1]] / span[interior]
+        distances[order] += contribution
+        distances[order[first | last]] = np.inf
+
+    return distances
+
+
 def calculate_crowding_distance(objectives, front):
     """
     计算拥挤度距离
@@ -52,28 +207,132 @@ def calculate_crowding_distance(objectives, front):
     Returns:
         拥挤度距离字典
     """
-    if len(front) <= 2:
-        return {i: float('inf') for i in front}
-    
-    distances = {i: 0 for i in front}
-    
-    # 对每个目标函数计算拥挤度
-    for m in range(len(objectives[0])):
-        # 按目标函数m排序
-        sorted_front = sorted(front, key=lambda i: objectives[i][m])
-        
-        # 边界点拥挤度设为无穷大
-        distances[sorted_front[0]] = float('inf')
-        distances[sorted_front[-1]] = float('inf')
-        
-        # 计算中间点的拥挤度
-        f_max = objectives[sorted_front[-1]][m]
-        f_min = objectives[sorted_front[0]][m]
-        
-        if f_max == f_min:
-            continue
-            
-        for i in range(1, len(sorted_front) - 1):
-            distances[sorted_front[i]] += (objectives[sorted_front[i+1]][m] - objectives[sorted_front[i-1]][m]) / (f_max - f_min)
-    
+    if len(front) == 0:
+        return {}
+    distances = crowding_distance(np.asarray(objectives, dtype=float)[front], np.zeros(len(front), dtype=np.int64))
+    return dict(zip(front, distances.tolist()))
+
+
+def _front_crowding(F):
+    """单个前沿的拥挤度，与 crowding_distance 对同一前沿的结果相同，但省去按等级分段的开销"""
+    n = len(F)
+    distances = np.zeros(n)
+    if n <= 2:
+        distances[:] = np.inf
+        return distances
+    for m in range(F.shape[1]):
+        order = np.argsort(F[:, m], kind='stable')
+        f = F[order, m]
+        span = f[-1] - f[0]
+        if span > 0:
+            distances[order[1:-1]] += (f[2:] - f[:-2]) / span
+        distances[order[0]] = distances[order[-1]] = np.inf
     return distances
+
+
+class IncrementalFronts:
+    """
+    增量维护的非支配前沿
+
+    在一组槽位上维护前沿划分、等级和拥挤度：插入个体时只把被它支配的个体逐层下移，
+    删除个体时只把不再被支配的个体逐层上移，并且只重算发生变化的前沿的拥挤度，不需要整体重新排序。
+    用于稳态进化中每到达一个子代就更新一次种群。
+    """
+
+    def __init__(self, objectives, slots):
+        """
+        Args:
+            objectives: (S, M) 按槽位存放的目标值数组，插入前由调用方写入对应行，本结构只读取
+            slots: 初始时在种群中的槽位
+        """
+        self.objectives = objectives
+        self.rank = np.full(len(objectives), -1, dtype=np.int64)   # 不在种群中的槽位为 -1
+        self.crowding = np.zeros(len(objectives))
+        slots = np.asarray(list(slots), dtype=np.int64)
+        self.fronts = [slots[front].tolist() for front in fast_non_dominated_sort(objectives[slots])]
+        for k in range(len(self.fronts)):
+            self._refresh(k)
+
+    def members(self):
+        """
+        Returns:
+            当前在种群中的槽位数组（升序）
+        """
+        return np.flatnonzero(self.rank >= 0)
+
+    def _dominated_by(self, dominators, candidates):
+        """candidates 中被 dominators 里任一个体支配的成员（布尔数组）"""
+        A = self.objectives[dominators][:, None, :]
+        B = self.objectives[candidates][None, :, :]
+        return ((A <= B).all(axis=2) & (A < B).any(axis=2)).any(axis=0)
+
+    def _refresh(self, k):
+        # 按槽位升序计算，目标值相同时拥挤度的分配与整体计算 crowding_distance 一致
+        front = sorted(self.fronts[k])
+        self.fronts[k] = front
+        self.rank[front] = k
+        self.crowding[front] = _front_crowding(self.objectives[front])
+
+    def insert(self, slot):
+        """
+        把槽位 slot 上的个体加入种群（目标值须已写入 objectives[slot]）
+        """
+        # 二分查找第一个不支配新个体的前沿：第k前沿中有个体支配它时，第k-1前沿中也一定有
+        lo, hi = 0, len(self.fronts)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._dominated_by(self.fronts[mid], [slot])[0]:
+                lo = mid + 1
+            else:
+                hi = mid
+        k, moving, changed = lo, [slot], []
+        while moving:
+            if k == len(self.fronts):
+                self.fronts.append(moving)
+                changed.append(k)
+                break
+            front = self.fronts[k]
+            down = self._dominated_by(moving, front)
+            self.fronts[k] = [v for v, d in zip(front, down) if not d] + moving
+            changed.append(k)
+            moving = [v for v, d in zip(front, down) if d]
+            k += 1
+        for k in changed:
+            self._refresh(k)
+
+    def remove(self, slot):
+        """
+        把槽位 slot 上的个体移出种群（调用时 objectives[slot] 仍须是该个体的目标值）
+        """
+        k = int(self.rank[slot])
+        self.fronts[k].remove(slot)
+        self.rank[slot] = -1
+        vacated, changed = [slot], [k]
+        while vacated and k + 1 < len(self.fronts):
+            below = self.fronts[k + 1]
+            # 只有被离开的个体支配、且不被第k前沿剩余个体支配的个体才上移
+            candidates = [v for v, d in zip(below, self._dominated_by(vacated, below)) if d]
+            if candidates and self.fronts[k]:
+                candidates = [v for v, d in zip(candidates, self._dominated_by(self.fronts[k], candidates)) if not d]
+            if not candidates:
+                break
+            moved = set(candidates)
+            self.fronts[k].extend(candidates)
+            self.fronts[k + 1] = [v for v in below if v not in moved]
+            vacated = candidates
+            k += 1
+            changed.append(k)
+        while self.fronts and not self.fronts[-1]:
+            self.fronts.pop()
+        for k in changed:
+            if k < len(self.fronts):
+                self._refresh(k)
+
+    def worst(self):
+        """
+        Returns:
+            最差个体的槽位：最后一个前沿中拥挤度最小者（并列时取槽位最大者，与环境选择的排序一致）
+        """
+        front = np.asarray(self.fronts[-1])
+        crowding = self.crowding[front]
+        return int(front[crowding == crowding.min()].max())
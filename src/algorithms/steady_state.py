@@ -0,0 +1,152 @@
+import queue
+import time
+from src.algorithms.GA import ga
+from src.algorithms.population import Population
+from src.algorithms.selection import binary_tournament_selection
+from src.algorithms.sorting import IncrementalFronts
+
+
+class SteadyStateGA(ga):
+    """
+    异步稳态 NSGA-II
+
+    没有代与代之间的同步点：工作进程持续评估子代，每个子代评估完成后立即插入种群，
+    并淘汰最差个体（等级最高、拥挤度最小），前沿由 IncrementalFronts 增量维护；
+    新的父代总是从最新的种群中选择。评估预算与代际版本相同，为 (generation - 1) * pop_size 个子代，
+    或由 set_budget / set_time_limit 设置的预算决定。
+    """
+
+    def __init__(self, generation, pop_size, cr, mu, Tmachinetime, de, workers=None, chunksize=None,
+                 cache_size=None, cache_canonical=False, in_flight=None, profiler=None, progress=None,
+                 archive_size=None):
+        """
+        Args:
+            generation, pop_size, cr, mu, Tmachinetime, de: 同 ga
+            workers: 工作进程数，None 或 1 表示在主进程中逐对评估
+            chunksize: 同 ga（仅影响初始种群的并行评估）
+            cache_size, cache_canonical: 同 ga；缓存只用于初始种群和串行评估
+            archive_size: 同 ga
+            profiler, progress: 同 ga；每插入 pop_size 个子代记为一代，计时只含 selection、crossover、mutation 和
+                                decode（使用工作进程时 decode 只含提交任务的耗时）
+            in_flight: 同时在途的评估任务数（每个任务为一对子代），默认每个工作进程2个，
+                       使工作进程完成一个任务时下一个已在队列中
+        """
+        # 每次只评估一对子代，逐个解码比批量解码的固定开销小
+        super().__init__(generation, pop_size, cr, mu, Tmachinetime, de, batch_decode=False, workers=workers,
+                         chunksize=chunksize, cache_size=cache_size, cache_canonical=cache_canonical,
+                         profiler=profiler, progress=progress, archive_size=archive_size)
+        self.in_flight = in_flight or (2 * workers if self.evaluator is not None else 1)
+        self.evaluations = 0   # 已插入种群的子代数
+        self.busy_time = 0.0   # 稳态阶段工作进程用于解码的CPU时间（秒）
+        self.wall_time = 0.0   # 稳态阶段的墙钟时间（秒）
+
+    def utilization(self):
+        """
+        Returns:
+            稳态阶段工作进程的平均利用率（解码CPU时间 / (工作进程数 × 墙钟时间)）
+        """
+        if self.evaluator is None or self.wall_time <= 0:
+            return None
+        return self.busy_time / (self.evaluator.workers * self.wall_time)
+
+    def total(self, job_length):
+        inst = self.de.instance
+        pop = Population(self.pop_size, job_length, max_gene=max(inst.n_jobs, inst.n_machines))
+        self.population = pop
+        self.archive.clear()
+        self.decodes = 0
+
+        # 从这里开始计量预算（初始种群的评估也计入）
+        if self.budget is not None:
+            self.budget.start()
+
+        if self.trace is not None:
+            self.trace.start()
+        if self.terminator is not None:
+            self.terminator.start()
+        self.stop_reason = None
+
+        # 初始化种群
+        self.random_init_population(job_length)
+        self.record_trace(0)
+
+        # 槽位 0..P-1 为种群，槽位 P 空闲；到达的子代写入空闲槽位，被淘汰个体的槽位成为新的空闲槽位
+        P = self.pop_size
+        fronts = IncrementalFronts(pop.objectives[:P + 1], range(P))
+        spare = P
+        max_evaluations = (self.generation - 1) * P
+
+        profiler = self.profiler
+        done = queue.SimpleQueue()
+        pending = 0
+        steady_start = time.perf_counter()
+        worker_start = self.evaluator.cpu_time if self.evaluator is not None else 0.0
+        while True:
+            # 补满在途任务，父代取自当前种群；评估次数预算把在途的子代也算上
+            # 提前停止后不再提交，等待在途任务完成
+            while (self.stop_reason is None and pending < self.in_flight and
+                   self.evaluations + 2 * pending < max_evaluations):
+                wanted = 2 * (pending + 1)
+                if self.budget is not None and (self.budget.exhausted() or
+                                                self.budget.remaining_evaluations(wanted) < wanted):
+                    self.stop_reason = 'budget'
+                    break
+                started = profiler.start()
+                members = fronts.members()
+                parents = members[binary_tournament_selection(fronts.rank[members], fronts.crowding[members], 2)]
+                job, machine = pop.job[parents], pop.machine[parents]
+                profiler.stop('selection', started)
+                self.variation.apply(job, machine, self.cr, self.mu, profiler)
+                started = profiler.start()
+                self._submit(job, machine, done)
+                profiler.stop('decode', started)
+                pending += 1
+            if pending == 0:
+                break
+
+            message = done.get()
+            pending -= 1
+            if isinstance(message, BaseException):
+                raise message
+            job, machine, objectives = message
+            # 串行评估时 evaluate 已提交给存档；工作进程的结果在主线程中提交
+            if self.evaluator is not None:
+                self.archive.offer_batch(objectives, job, machine)
+            for i in range(len(job)):
+                pop.job[spare], pop.machine[spare], pop.objectives[spare] = job[i], machine[i], objectives[i]
+                fronts.insert(spare)
+                worst = fronts.worst()
+                fronts.remove(worst)
+                spare = worst
+                self.evaluations += 1
+                if self.evaluations % P == 0:
+                    profiler.end_generation()
+                    self.record_trace(self.evaluations // P)
+                    if self.progress:
+                        self.progress(self.evaluations // P, self)
+                    if self.stop_reason is None:
+                        self.check_stagnation()
+        self.wall_time = time.perf_counter() - steady_start
+        if self.stop_reason is None:
+            self.stop_reason = 'generations'
+        if self.evaluator is not None:
+            self.busy_time = self.evaluator.cpu_time - worker_start
+
+        # 把种群搬回父代位置，结果格式与 ga.total 相同
+        pop.survive(fronts.members(), fronts.rank, fronts.crowding)
+        return self.pareto_result()
+
+    def _submit(self, job, machine, done):
+        """评估一对子代，完成后把 (工序编码, 机器编码, 目标值) 放入 done"""
+        if self.evaluator is None:
+            done.put((job, machine, self.evaluate(job, machine)))
+            return
+
+        def finished(objectives):
+            if self.budget is not None:
+                self.budget.add_evaluations(len(job))
+            self.profiler.count_evaluations(len(job))
+            self.decodes += len(job)
+            done.put((job, machine, objectives))
+
+        self.evaluator.submit(job, machine, finished, error_callback=done.put)
@@ -0,0 +1,94 @@
+from collections import deque
+import numpy as np
+from src.utils.metrics import Hypervolume2D
+
+# ga.stop_reason 的取值
+STOP_REASONS = ('generations', 'budget', 'stagnation', 'lower_bound')
+
+
+class StagnationTerminator:
+    """
+    收敛判断（可选的提前停止）
+
+    每代结束时检查外部存档：
+    - 最近 window 代超体积的相对提升小于 epsilon 时返回 'stagnation'
+    - 存档中最小完工时间已达到 cmax_lower_bound 时返回 'lower_bound'
+
+    超体积的参考点默认取初始存档各目标最大值的 (1 + margin) 倍，整个运行中固定不变。
+    """
+
+    def __init__(self, window=20, epsilon=1e-3, reference_point=None, cmax_lower_bound=None, margin=0.1):
+        """
+        Args:
+            window: 比较超体积的代数间隔
+            epsilon: 相对提升的阈值
+            reference_point: 超体积参考点 (C_max, TEC)，None 时由初始存档确定
+            cmax_lower_bound: 完工时间下界，None 时不检查
+            margin: 自动确定参考点时在最大值上放大的比例
+        """
+        if window < 1:
+            raise ValueError('window 至少为1')
+        self.window = window
+        self.epsilon = epsilon
+        self.reference_point = reference_point
+        self.cmax_lower_bound = cmax_lower_bound
+        self.margin = margin
+        self.start()
+
+    def start(self):
+        """清空历史（ga.total 开始时调用）"""
+        self._hypervolume = None
+        self._history = deque(maxlen=self.window + 1)
+        self._version = None
+
+    def state(self):
+        """
+        Returns:
+            可写入检查点的数组字典：参考点（未确定时为空）、超体积的当前前沿和值、最近各代的超体积、版本号
+        """
+        hypervolume = self._hypervolume
+        return {'reference': np.array(hypervolume.reference_point if hypervolume is not None else [], dtype=float),
+                'front': hypervolume.front if hypervolume is not None else np.zeros((0, 2)),
+                'value': hypervolume.value if hypervolume is not None else 0.0,
+                'history': np.array(self._history, dtype=float),
+                'version': np.array(self._version if self._version is not None else [], dtype=np.int64)}
+
+    def restore(self, state):
+        """从 state() 的结果恢复"""
+        self.start()
+        reference = np.asarray(state['reference']).tolist()
+        if reference:
+            self._hypervolume = Hypervolume2D.restore(reference, state['front'], state['value'])
+        self._history.extend(np.asarray(state['history']).tolist())
+        version = np.asarray(state['version']).tolist()
+        self._version = tuple(version) if version else None
+
+    def update(self, archive):
+        """
+        记录一代并判断是否应当停止
+
+        Args:
+            archive: 外部存档（ParetoArchive）
+
+        Returns:
+            停止原因 'stagnation' / 'lower_bound'，不停止时为 None
+        """
+        version = (archive.accepted, len(archive))
+        if version != self._version:
+            self._version = version
+            front = archive.objectives
+            if self._hypervolume is None:
+                reference = self.reference_point
+                if reference is None:
+                    reference = front.max(axis=0) * (1 + self.margin)
+                self._hypervolume = Hypervolume2D(reference)
+            self._hypervolume.update(front)
+            if self.cmax_lower_bound is not None and len(front) and front[0, 0] <= self.cmax_lower_bound:
+                return 'lower_bound'
+        history = self._history
+        history.append(self._hypervolume.value)
+        if len(history) > self.window:
+            old = history[0]
+            if history[-1] - old <= self.epsilon * max(abs(old), np.finfo(float).tiny):
+                return 'stagnation'
+        return None
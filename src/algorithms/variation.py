@@ -0,0 +1,136 @@
+import numpy as np
+from src.utils.profiler import NULL_PROFILER
+
+
+class Variation:
+    """
+    批量交叉与变异
+
+    对整个交配池 (P, n) 一次完成 POX/UX 交叉和插入/重分配变异，
+    第 2k 与 2k+1 行为一对父代。
+    """
+
+    def __init__(self, instance):
+        """
+        Args:
+            instance: 编译后的算例（src.utils.instance.Instance）
+        """
+        self.instance = instance
+        self._job_ids = np.arange(instance.n_jobs + 1)
+
+    def pox(self, parents1, parents2):
+        """
+        批量部分顺序交叉(POX)
+
+        每对父代随机切分工件集合；子代1保留parent1中集合1的基因位置，空位按顺序用parent2中集合2的基因填，子代2反之。
+
+        Args:
+            parents1: (K, n) 第一个父代的工序编码
+            parents2: (K, n) 第二个父代的工序编码
+
+        Returns:
+            两个 (K, n) 子代工序编码
+        """
+        K = len(parents1)
+        split_index = np.random.randint(0, self.instance.n_jobs, K)
+        in_set1 = (self._job_ids[None, :] <= split_index[:, None] + 1)   # in_set1[k, 工件号]
+        in_set1[:, 0] = False
+
+        rows = np.arange(K)[:, None]
+        fill1 = ~in_set1[rows, parents1]   # parent1中属于集合2的位置，即子代1的空位
+        fill2 = ~in_set1[rows, parents2]
+        offspring1 = parents1.copy()
+        offspring2 = parents2.copy()
+        # 布尔索引按行优先展开且每行空位数与待填基因数相同，可一次按顺序填充
+        offspring1[fill1] = parents2[fill2]
+        offspring2[fill2] = parents1[fill1]
+        return offspring1, offspring2
+
+    def ux(self, parents1_machine, parents2_machine):
+        """
+        批量均匀交叉(UX)：一个随机掩码矩阵决定每个位置是否交换
+
+        Args:
+            parents1_machine: (K, n) 第一个父代的机器编码
+            parents2_machine: (K, n) 第二个父代的机器编码
+
+        Returns:
+            两个 (K, n) 子代机器编码
+        """
+        mask = np.random.random(parents1_machine.shape) < 0.5
+        child1_machine = np.where(mask, parents2_machine, parents1_machine)
+        child2_machine = np.where(mask, parents1_machine, parents2_machine)
+        return child1_machine, child2_machine
+
+    def OS_mutation(self, OS):
+        """
+        批量工序编码插入变异：每行随机取 pos1 < pos2，把 pos2 处的基因插入到 pos1
+
+        Args:
+            OS: (K, n) 工序编码
+
+        Returns:
+            (K, n) 变异后的工序编码
+        """
+        K, n = OS.shape
+        if n <= 1:
+            return OS.copy()
+        a = np.random.randint(0, n, K)
+        b = (a + np.random.randint(1, n, K)) % n        # 与a不同的位置
+        pos1, pos2 = np.minimum(a, b)[:, None], np.maximum(a, b)[:, None]
+
+        j = np.arange(n)[None, :]
+        source = j - ((j > pos1) & (j <= pos2))          # pos1+1..pos2 取前一个位置的基因
+        source = np.where(j == pos1, pos2, source)       # pos1 取原 pos2 的基因
+        return np.take_along_axis(OS, source, axis=1)
+
+    def MS_mutation(self, MS):
+        """
+        批量机器编码重分配变异：每行随机选一道工序，从可选机器表中重新抽取一台
+
+        Args:
+            MS: (K, n) 机器编码
+
+        Returns:
+            (K, n) 变异后的机器编码
+        """
+        K, n = MS.shape
+        MS = MS.copy()
+        if n == 0:
+            return MS
+        inst = self.instance
+        pos = np.random.randint(0, n, K)
+        choice = (np.random.random(K) * inst.n_eligible[pos]).astype(np.int64)
+        MS[np.arange(K), pos] = inst.mach_idx[inst.mach_ptr[pos] + choice]
+        return MS
+
+    def apply(self, job, machine, cr, mu, profiler=NULL_PROFILER):
+        """
+        原地对交配池做交叉和变异
+
+        每对父代以概率cr同时做POX和UX；再以概率mu对这一对的两个子代同时做OS、MS变异。
+
+        Args:
+            job: (P, n) 工序编码交配池
+            machine: (P, n) 机器编码交配池
+            cr: 交叉概率
+            mu: 变异概率
+            profiler: 性能计时器，分别计入 'crossover' 和 'mutation' 阶段
+        """
+        n_pairs = len(job) // 2
+        crossed = np.flatnonzero(np.random.random(n_pairs) < cr)
+        mutated = np.flatnonzero(np.random.random(n_pairs) < mu)
+
+        started = profiler.start()
+        if len(crossed):
+            first, second = 2 * crossed, 2 * crossed + 1
+            job[first], job[second] = self.pox(job[first], job[second])
+            machine[first], machine[second] = self.ux(machine[first], machine[second])
+        profiler.stop('crossover', started)
+
+        started = profiler.start()
+        if len(mutated):
+            rows = np.concatenate((2 * mutated, 2 * mutated + 1))
+            job[rows] = self.OS_mutation(job[rows])
+            machine[rows] = self.MS_mutation(machine[rows])
+        profiler.stop('mutation', started)
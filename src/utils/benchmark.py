@@ -0,0 +1,219 @@
+'''
+性能基准：在 data/Brandimarte_Data 的全部算例上运行固定种子的负载，测量热点路径的吞吐量
+
+指标（每个算例）：
+- decode_evals_per_sec：de.caculate 逐个解码的吞吐量（个体/秒）
+- batch_evals_per_sec：de.caculate_batch 批量解码的吞吐量（个体/秒）
+- ga_seconds_per_generation：ga.total 每代耗时（秒）
+- ga_peak_memory_mb：ga.total 运行期间 tracemalloc 记录的内存峰值（MB）
+- ga_cmax_gap / ga_tec_gap：ga.total 得到的最小完工时间 / 最小能耗与算例下界（de.lower_bounds）的相对差距
+以及与算例无关的 sort_per_sec_N{N}：fast_non_dominated_sort 在 N 个双目标点上的吞吐量（次/秒）
+
+运行方式（项目根目录）：
+    python -m src.utils.benchmark                          # 运行并打印
+    python -m src.utils.benchmark save [基线文件]           # 运行并保存为基线
+    python -m src.utils.benchmark compare [基线文件] [阈值]  # 与基线比较，任一指标变差超过阈值（默认0.1）时退出码为1
+'''
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import src.utils.data as da
+from src.algorithms.decode import decode
+from src.algorithms.GA import ga
+from src.algorithms.initialization import Initialization
+from src.algorithms.sorting import fast_non_dominated_sort
+from src.utils.sort_benchmark import random_objectives
+
+DATA_SOURCE = 'Brandimarte_Data'
+BASELINE_PATH = './results/benchmark_baseline.json'
+SEED = 12345
+N_INDIVIDUALS = 200                 # 解码吞吐量测试的个体数
+SORT_SIZES = (100, 1000, 10000)
+GA_GENERATIONS, GA_POP_SIZE = 20, 50
+MIN_SECONDS = 0.2                   # 每个吞吐量测量至少持续的时间
+REPEAT = 3                          # 重复次数，取最好的一次
+
+# 指标方向：True 表示越大越好
+HIGHER_IS_BETTER = {'decode_evals_per_sec': True, 'batch_evals_per_sec': True, 'sort_per_sec': True,
+                    'ga_seconds_per_generation': False, 'ga_peak_memory_mb': False,
+                    'ga_cmax_gap': False, 'ga_tec_gap': False}
+
+
+def instances(da_=DATA_SOURCE):
+    """数据源下的全部算例名（按名称排序）"""
+    names = {os.path.splitext(name)[0] for name in os.listdir(f'./data/{da_}') if name.endswith(('.txt', '.fjs'))}
+    return sorted(names)
+
+
+def throughput(func, items_per_call):
+    """
+    反复调用 func 至少 MIN_SECONDS 秒，重复 REPEAT 次取最好结果
+
+    Returns:
+        每秒处理的项目数
+    """
+    best = 0.0
+    for _ in range(REPEAT):
+        calls, start = 0, time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_SECONDS:
+                break
+        best = max(best, calls * items_per_call / elapsed)
+    return best
+
+
+def seed_all(seed=SEED):
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def bench_instance(name, da_=DATA_SOURCE):
+    """
+    Returns:
+        该算例的指标字典
+    """
+    work, Tmachinetime = da.read(da_, name)
+    de = decode(work, Tmachinetime)
+
+    seed_all()
+    init = Initialization(de.instance)
+    individuals = [init.creat() for _ in range(N_INDIVIDUALS)]
+    OS_matrix = np.array([OS for OS, _ in individuals])
+    MS_matrix = np.array([MS for _, MS in individuals])
+
+    def decode_all():
+        for OS, MS in individuals:
+            de.caculate(OS, MS)
+
+    metrics = {
+        'decode_evals_per_sec': throughput(decode_all, N_INDIVIDUALS),
+        'batch_evals_per_sec': throughput(lambda: de.caculate_batch(OS_matrix, MS_matrix), N_INDIVIDUALS),
+    }
+
+    fronts = []
+
+    def run_ga():
+        seed_all()
+        h = ga(GA_GENERATIONS, GA_POP_SIZE, 0.8, 0.15, Tmachinetime, de, progress=False)
+        start = time.perf_counter()
+        front, _ = h.total(len(work))
+        elapsed = time.perf_counter() - start
+        fronts.append(front)
+        return elapsed
+
+    metrics['ga_seconds_per_generation'] = min(run_ga() for _ in range(REPEAT)) / (GA_GENERATIONS - 1)
+    # 固定种子，每次运行的前沿相同
+    cmax_gap, tec_gap = de.lower_bounds.gap(np.min(fronts[0], axis=0))
+    metrics['ga_cmax_gap'], metrics['ga_tec_gap'] = float(cmax_gap), float(tec_gap)
+    # tracemalloc 会拖慢内存分配，内存峰值单独运行一次测量
+    tracemalloc.start()
+    run_ga()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    metrics['ga_peak_memory_mb'] = peak / 2 ** 20
+    return metrics
+
+
+def bench_sort():
+    """
+    Returns:
+        {'sort_per_sec_N{N}': 吞吐量}
+    """
+    return {f'sort_per_sec_N{n}': throughput(lambda F=random_objectives(n, 2, SEED): fast_non_dominated_sort(F), 1)
+            for n in SORT_SIZES}
+
+
+def run(names=None, da_=DATA_SOURCE):
+    """
+    Returns:
+        {'meta': 运行环境与负载设置, 'sort': 排序指标, 'instances': {算例名: 指标字典}}
+    """
+    names = instances(da_) if names is None else names
+    report = {
+        'meta': {'time': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+                 'numpy': np.__version__, 'machine': platform.machine(), 'processor': platform.processor(),
+                 'seed': SEED, 'n_individuals': N_INDIVIDUALS, 'ga_generations': GA_GENERATIONS,
+                 'ga_pop_size': GA_POP_SIZE, 'data_source': da_},
+        'sort': bench_sort(),
+        'instances': {},
+    }
+    for name in names:
+        report['instances'][name] = bench_instance(name, da_)
+    return report
+
+
+def _higher_is_better(metric):
+    return HIGHER_IS_BETTER[metric.split('_N')[0]]
+
+
+def compare(report, baseline, threshold=0.1):
+    """
+    逐项比较当前结果与基线
+
+    Args:
+        report: run() 的结果
+        baseline: 基线（同样格式）
+        threshold: 允许的相对变差比例
+
+    Returns:
+        列表，每项为 {'name', 'metric', 'baseline', 'current', 'change', 'regressed'}；
+        change 为相对变化，正数表示变好
+    """
+    pairs = [('sort', metric, baseline['sort'].get(metric), value) for metric, value in report['sort'].items()]
+    for name, metrics in report['instances'].items():
+        for metric, value in metrics.items():
+            pairs.append((name, metric, baseline['instances'].get(name, {}).get(metric), value))
+
+    rows = []
+    for name, metric, old, new in pairs:
+        if old is None or old == 0:
+            continue
+        change = (new - old) / old if _higher_is_better(metric) else (old - new) / old
+        rows.append({'name': name, 'metric': metric, 'baseline': old, 'current': new, 'change': change,
+                     'regressed': change < -threshold})
+    return rows
+
+
+def print_report(report):
+    for metric, value in report['sort'].items():
+        print(f'{metric:>28}: {value:,.1f}')
+    metrics = list(next(iter(report['instances'].values())).keys()) if report['instances'] else []
+    print(f"{'算例':>6} " + ' '.join(f'{m:>26}' for m in metrics))
+    for name, row in report['instances'].items():
+        print(f'{name:>6} ' + ' '.join(f'{row[m]:>26,.4f}' for m in metrics))
+
+
+if __name__ == '__main__':
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'run'
+    path = sys.argv[2] if len(sys.argv) > 2 else BASELINE_PATH
+    report = run()
+    print_report(report)
+
+    if mode == 'save':
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f'基线已保存至: {path}')
+    elif mode == 'compare':
+        threshold = float(sys.argv[3]) if len(sys.argv) > 3 else 0.1
+        with open(path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, threshold)
+        for row in rows:
+            flag = '退化' if row['regressed'] else ''
+            print(f"{row['name']:>6} {row['metric']:>28} {row['baseline']:>14,.4f} -> {row['current']:>14,.4f} "
+                  f"{row['change']:>+8.1%} {flag}")
+        regressed = [row for row in rows if row['regressed']]
+        if regressed:
+            print(f'{len(regressed)} 项指标相对基线变差超过 {threshold:.0%}')
+            sys.exit(1)
+        print('所有指标均未超过退化阈值')
@@ -0,0 +1,59 @@
+'''
+算例的下界（完工时间与总能耗）
+
+只依赖编译后的算例和能耗参数，构建 decode 时计算一次（de.lower_bounds），
+用于提前停止，以及在不额外求解的情况下报告与下界的差距。
+'''
+import numpy as np
+
+
+class LowerBounds:
+    """
+    - job:          max_j Σ 工件j各工序的最短加工时间（工件内工序串行）
+    - machine_load: ⌈Σ 所有工序的最短加工时间 / 机器数⌉（总工作量最少平均分到所有机器）
+    - makespan:     max(job, machine_load)
+    - energy:       (加工功率 - 空闲功率) × Σ最短加工时间 + 空闲功率 × 机器数下界 × makespan
+
+    能耗按 decode 的模型 TEC = 加工功率 × W + 空闲功率 × (m × C_max - W) = (加工功率 - 空闲功率) × W + 空闲功率 × m × C_max，
+    其中 W 为总加工时长，m 为编码中用到的最大机器号，因此 m 至少为各工序最小可选机器号的最大值。
+    """
+
+    def __init__(self, instance, processing_power, idle_power):
+        """
+        Args:
+            instance: 编译后的算例（Instance）
+            processing_power: 加工功率（kW）
+            idle_power: 空闲功率（kW）
+        """
+        if processing_power < idle_power or idle_power < 0:
+            raise ValueError('能耗下界要求 加工功率 >= 空闲功率 >= 0')
+        min_time = instance.min_time
+        job_start = instance.job_start
+        job_work = np.add.reduceat(min_time, job_start[:-1])
+        total_work = int(min_time.sum())
+
+        self.job = int(job_work.max())
+        self.machine_load = -(-total_work // instance.n_machines)
+        self.makespan = max(self.job, self.machine_load)
+        self.total_work = total_work
+        self.min_machine_count = int(np.minimum.reduceat(instance.mach_idx, instance.mach_ptr[:-1]).max())
+        self.energy = float((processing_power - idle_power) * total_work
+                            + idle_power * self.min_machine_count * self.makespan)
+
+    @property
+    def objectives(self):
+        """[C_max 下界, TEC 下界]"""
+        return [float(self.makespan), self.energy]
+
+    def gap(self, objectives):
+        """
+        与下界的相对差距
+
+        Args:
+            objectives: [C_max, TEC] 或 (n, 2) 数组
+
+        Returns:
+            与 objectives 同形状的 (值 - 下界) / 下界
+        """
+        bound = np.array(self.objectives)
+        return (np.asarray(objectives, dtype=float) - bound) / bound
@@ -1,8 +1,127 @@
 '''
 数据读取文件
+
+read 每次解析文本，返回 Python 列表；load 返回编译后的 Instance：首次加载时解析文本并在
+data/<数据源>/.cache/ 下写出二进制副本，之后以只读内存映射打开，多个进程共享同一份页面。
 '''
+import hashlib
 import re
 import os
+import numpy as np
+from src.utils.instance import Instance
+
+CACHE_DIR = '.cache'
+CACHE_MAGIC = 0x4A53504643      # 'FJSPC'
+CACHE_VERSION = 1
+# 缓存文件是一个 int64 的 .npy：头部 [魔数, 版本, 源文件mtime(ns), 源文件哈希, n_ops, n_jobs, n_machines, 可选(工序,机器)对数]，
+# 之后依次为 op_job、job_start、mach_ptr、mach_idx、mach_time、n_eligible、min_time、proc_time（按行展开）
+HEADER_SIZE = 8
+
+
+def source_path(da_, a):
+    """算例的源文件路径：优先 .txt，若不存在则为 .fjs"""
+    txt_path = f'./data/{da_}/{a}.txt'
+    fjs_path = f'./data/{da_}/{a}.fjs'
+    if os.path.exists(txt_path):
+        return txt_path
+    if os.path.exists(fjs_path):
+        return fjs_path
+    raise FileNotFoundError(f'未找到数据文件：{txt_path} 或 {fjs_path}')
+
+
+def cache_path(da_, a):
+    return f'./data/{da_}/{CACHE_DIR}/{a}.npy'
+
+
+def _source_hash(path):
+    with open(path, 'rb') as f:
+        digest = hashlib.blake2b(f.read(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little', signed=True)
+
+
+def load(da_, a, cache=True):
+    """
+    读取编译后的算例
+
+    缓存以源文件的 mtime 和内容哈希为键：mtime 未变时直接使用缓存；mtime 变了但内容哈希相同时仍使用缓存；
+    否则重新解析并覆盖缓存。缓存文件先写临时文件再 os.replace，并发加载的进程不会读到写了一半的文件；
+    缓存文件截断或损坏时同样重新解析并覆盖。
+
+    Args:
+        da_: 数据源文件夹名
+        a: 算例名
+        cache: False 时不读写缓存，直接解析文本
+
+    Returns:
+        Instance；使用缓存时各数组是只读内存映射的视图
+    """
+    path = source_path(da_, a)
+    if not cache:
+        return Instance.compile(*read(da_, a))
+
+    target = cache_path(da_, a)
+    mtime = os.stat(path).st_mtime_ns
+    instance, source_hash = _read_cache(target, path, mtime)
+    if instance is not None:
+        return instance
+
+    instance = Instance.compile(*read(da_, a))
+    if source_hash is None:
+        source_hash = _source_hash(path)
+    _write_cache(target, instance, mtime, source_hash)
+    return instance
+
+
+def _read_cache(target, path, mtime):
+    """
+    Returns:
+        (Instance，缓存不存在、已过期或已损坏时为 None；计算过的源文件哈希，未计算时为 None)
+    """
+    source_hash = None
+    if not os.path.exists(target):
+        return None, source_hash
+    try:
+        buf = np.load(target, mmap_mode='r')
+        if buf.dtype != np.int64 or buf.ndim != 1 or len(buf) < HEADER_SIZE:
+            return None, source_hash
+        header = buf[:HEADER_SIZE]
+        if header[0] != CACHE_MAGIC or header[1] != CACHE_VERSION:
+            return None, source_hash
+        if header[2] != mtime:
+            source_hash = _source_hash(path)
+            if header[3] != source_hash:
+                return None, source_hash
+        return _from_buffer(buf), source_hash
+    except (OSError, ValueError, EOFError):
+        # 缓存是派生数据，读不出来就当作不存在，由调用方重新解析并覆盖
+        return None, source_hash
+
+
+def _write_cache(target, instance, mtime, source_hash):
+    header = [CACHE_MAGIC, CACHE_VERSION, mtime, source_hash,
+              instance.n_ops, instance.n_jobs, instance.n_machines, len(instance.mach_idx)]
+    buf = np.concatenate([np.array(header, dtype=np.int64), instance.op_job, instance.job_start, instance.mach_ptr,
+                          instance.mach_idx, instance.mach_time, instance.n_eligible, instance.min_time,
+                          instance.proc_time.ravel()])
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = f'{target}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        np.save(f, buf)
+    os.replace(tmp, target)
+
+
+def _from_buffer(buf):
+    buf = np.asarray(buf)       # 普通 ndarray 视图，仍指向映射的页面
+    n_ops, n_jobs, n_machines, n_entries = (int(v) for v in buf[4:HEADER_SIZE])
+    sizes = [n_ops, n_jobs + 1, n_ops + 1, n_entries, n_entries, n_ops, n_ops, n_ops * n_machines]
+    offsets = np.cumsum([HEADER_SIZE] + sizes)
+    if offsets[-1] != len(buf):
+        raise ValueError('算例缓存文件已损坏')
+    op_job, job_start, mach_ptr, mach_idx, mach_time, n_eligible, min_time, proc_time = (
+        buf[start:end] for start, end in zip(offsets[:-1], offsets[1:]))
+    return Instance.from_arrays(op_job, job_start, proc_time.reshape(n_ops, n_machines), mach_ptr, mach_idx,
+                                mach_time, n_eligible, min_time)
+
 
 def read(da_,a):
     # 支持 .txt 和 .fjs 两种格式；优先读取 .txt，若不存在则读取 .fjs
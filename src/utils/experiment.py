@@ -0,0 +1,314 @@
+'''
+并行、可续跑的多次运行实验
+
+把 (算例 × 配置 × 运行编号) 展开为相互独立的任务分发到进程池，每个任务使用由
+(主种子, 数据源, 算例, 配置名, 运行编号) 派生的独立种子，结果与执行顺序和进程数无关。
+每完成一次运行，主进程立即把它的帕累托前沿追加写入 all_pareto_points.csv，再在 runs.csv 中追加一行完成记录；
+重新启动时跳过 runs.csv 中已记录的运行，并清除上次中断时只写了一半的前沿点。
+全部运行结束后合并各次运行的前沿，写出 final_pareto_front.csv。
+
+输出目录：results/<数据源>/<算例>/；配置名不是 'default' 时为 results/<数据源>/<算例>/<配置名>/
+'''
+import csv
+import multiprocessing as mp
+import os
+import random
+import time
+import zlib
+import numpy as np
+import src.utils.data as da
+from src.algorithms.decode import decode
+from src.algorithms.GA import ga
+from src.algorithms.sorting import fast_non_dominated_sort
+
+POINTS_FILE = 'all_pareto_points.csv'
+RUNS_FILE = 'runs.csv'
+FINAL_FILE = 'final_pareto_front.csv'
+POINT_COLUMNS = ['运行ID', '目标1_完工时间', '目标2_能量消耗']
+RUN_COLUMNS = ['运行ID', '种子', '运行时间', 'CPU时间', '评估次数', '解数', '停止条件']
+FINAL_COLUMNS = ['运行ID', '目标1_完工时间', '目标2_能量消耗', '是否为最终帕累托解']
+
+# 单次运行的默认参数；cpu_time 不为 None 时按 cpu_time × 工序数 / 1000 秒的CPU时间预算停止；
+# stagnation 不为 None 时为 ga.set_stagnation 的参数字典（如 {'window': 20, 'epsilon': 1e-3}），前沿停滞时提前停止
+DEFAULT_CONFIG = {'generation': 200, 'popsize': 50, 'cr': 0.8, 'mu': 0.2, 'cpu_time': None,
+                  'decode_mode': 'semi-active', 'stagnation': None}
+# ga.stop_reason 在 runs.csv 中的写法
+STOP_LABELS = {'generations': '迭代次数', 'budget': 'CPU时间限制', 'stagnation': '前沿停滞', 'lower_bound': '达到下界'}
+
+
+def job_seed(base_seed, da_, name, config_name, run_id):
+    """由主种子和任务标识派生独立种子（不依赖 Python 的随机化字符串哈希）"""
+    key = zlib.crc32(f'{da_}/{name}/{config_name}'.encode('utf-8'))
+    return int(np.random.SeedSequence([base_seed, key, run_id]).generate_state(1)[0])
+
+
+def run_job(job):
+    """
+    在工作进程中执行一次运行
+
+    Args:
+        job: 任务字典，见 Experiment.jobs
+
+    Returns:
+        job 加上 'front'、'runtime'、'cpu_time'、'evaluations'、'stop' 的字典
+    """
+    random.seed(job['seed'])
+    np.random.seed(job['seed'])
+    config = job['config']
+
+    start, cpu_start = time.perf_counter(), time.process_time()
+    instance = da.load(job['da'], job['name'])
+    de = decode(None, None, instance=instance, mode=config['decode_mode'])
+    h = ga(config['generation'], config['popsize'], config['cr'], config['mu'], None, de, progress=False)
+    if config['cpu_time'] is not None:
+        h.set_budget('cpu', config['cpu_time'] * instance.n_ops / 1000.0)
+    if config['stagnation'] is not None:
+        h.set_stagnation(**config['stagnation'])
+    front, _ = h.total(instance.n_ops)
+
+    result = dict(job)
+    result.update({'front': front, 'runtime': time.perf_counter() - start,
+                   'cpu_time': time.process_time() - cpu_start,
+                   'evaluations': h.budget.evaluations if h.budget is not None else None,
+                   'stop': STOP_LABELS[h.stop_reason]})
+    return result
+
+
+class Experiment:
+    """
+    多次运行实验
+    """
+
+    def __init__(self, datasets, num_runs, configs=None, results_dir='results', workers=None, seed=42):
+        """
+        Args:
+            datasets: 算例列表，如 [{'name': 'Mk01', 'da': 'Brandimarte_Data'}, ...]
+            num_runs: 每个 (算例, 配置) 的运行次数，运行ID为 1..num_runs
+            configs: {配置名: 覆盖 DEFAULT_CONFIG 的参数字典}，默认只有 'default'
+            results_dir: 结果根目录
+            workers: 进程数，默认为CPU核数
+            seed: 主随机种子
+        """
+        self.datasets = datasets
+        self.num_runs = num_runs
+        self.configs = {name: {**DEFAULT_CONFIG, **overrides} for name, overrides in (configs or {'default': {}}).items()}
+        self.results_dir = results_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+
+    def output_dir(self, dataset, config_name):
+        path = os.path.join(self.results_dir, dataset['da'], dataset['name'])
+        return path if config_name == 'default' else os.path.join(path, config_name)
+
+    def jobs(self):
+        """
+        Returns:
+            全部任务列表，每项为 {'da', 'name', 'config_name', 'config', 'run_id', 'seed', 'dir'}
+        """
+        jobs = []
+        for dataset in self.datasets:
+            for config_name, config in self.configs.items():
+                for run_id in range(1, self.num_runs + 1):
+                    jobs.append({'da': dataset['da'], 'name': dataset['name'], 'config_name': config_name,
+                                 'config': config, 'run_id': run_id,
+                                 'seed': job_seed(self.seed, dataset['da'], dataset['name'], config_name, run_id),
+                                 'dir': self.output_dir(dataset, config_name)})
+        return jobs
+
+    def pending_jobs(self):
+        """
+        尚未完成的任务；同时清除已写入 all_pareto_points.csv 但没有完成记录的运行（上次中断留下的）
+
+        Returns:
+            任务列表，工序数多的算例排在前面，以缩短最后几个任务拖尾的时间
+        """
+        jobs = self.jobs()
+        completed = {}
+        for directory in {job['dir'] for job in jobs}:
+            _adopt_legacy_points(directory)
+            completed[directory] = done = completed_runs(directory)
+            _drop_incomplete_points(directory, done)
+        pending = [job for job in jobs if job['run_id'] not in completed[job['dir']]]
+        sizes = {}
+        for job in pending:
+            key = (job['da'], job['name'])
+            if key not in sizes:
+                sizes[key] = da.load(*key).n_ops
+        pending.sort(key=lambda job: -sizes[(job['da'], job['name'])])
+        return pending
+
+    def run(self, progress=None):
+        """
+        执行所有未完成的任务并合并前沿
+
+        Args:
+            progress: 每完成一次运行调用一次 progress(已完成数, 任务总数, 运行结果)
+
+        Returns:
+            {(算例名, 配置名): 合并后的帕累托前沿 [[C_max, TEC], ...]}
+        """
+        pending = self.pending_jobs()
+        writers = {}
+        try:
+            if pending:
+                methods = mp.get_all_start_methods()
+                ctx = mp.get_context('fork' if 'fork' in methods else None)
+                with ctx.Pool(min(self.workers, len(pending))) as pool:
+                    for k, result in enumerate(pool.imap_unordered(run_job, pending, chunksize=1), start=1):
+                        if result['dir'] not in writers:
+                            writers[result['dir']] = RunWriter(result['dir'])
+                        writers[result['dir']].write(result)
+                        if progress is not None:
+                            progress(k, len(pending), result)
+        finally:
+            for writer in writers.values():
+                writer.close()
+        return self.finalize()
+
+    def finalize(self):
+        """
+        合并每个 (算例, 配置) 所有运行的前沿，写出 final_pareto_front.csv
+
+        Returns:
+            {(算例名, 配置名): 合并后的帕累托前沿}
+        """
+        fronts = {}
+        for dataset in self.datasets:
+            for config_name in self.configs:
+                directory = self.output_dir(dataset, config_name)
+                fronts[(dataset['name'], config_name)] = write_final_front(directory)
+        return fronts
+
+
+class RunWriter:
+    """
+    追加写入一个输出目录的结果文件
+
+    文件在首次写入时打开并保持打开（带缓冲），每次运行写完后按"前沿点 → 完成记录"的顺序刷新，
+    保证 runs.csv 中出现的运行，其前沿点已全部落盘。
+    """
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self._points, self._points_writer = _open_append(os.path.join(directory, POINTS_FILE), POINT_COLUMNS)
+        self._runs, self._runs_writer = _open_append(os.path.join(directory, RUNS_FILE), RUN_COLUMNS)
+
+    def write(self, result):
+        self._points_writer.writerows([result['run_id'], c_max, tec] for c_max, tec in result['front'])
+        self._points.flush()
+        self._runs_writer.writerow([result['run_id'], result['seed'], f"{result['runtime']:.3f}",
+                                    f"{result['cpu_time']:.3f}", result['evaluations'] if result['evaluations'] is not None else '',
+                                    len(result['front']), result['stop']])
+        self._runs.flush()
+
+    def close(self):
+        self._points.close()
+        self._runs.close()
+
+
+def _open_append(path, columns):
+    new = not os.path.exists(path) or os.path.getsize(path) == 0
+    f = open(path, 'a', newline='', encoding='utf-8')
+    writer = csv.writer(f)
+    if new:
+        writer.writerow(columns)
+    return f, writer
+
+
+def _read_rows(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def completed_runs(directory):
+    """runs.csv 中已完成的运行ID集合"""
+    return {int(row['运行ID']) for row in _read_rows(os.path.join(directory, RUNS_FILE))}
+
+
+def read_runs(directory):
+    """
+    Returns:
+        runs.csv 的记录列表（字典）
+    """
+    return _read_rows(os.path.join(directory, RUNS_FILE))
+
+
+def run_metric(run, column):
+    """
+    runs.csv 中某一数值列的值
+
+    Args:
+        run: read_runs 返回的一条记录
+        column: 列名，如 '运行时间'
+
+    Returns:
+        浮点数；旧版结果补写的完成记录（见 _adopt_legacy_points）该列为空，返回 None
+    """
+    value = run.get(column, '')
+    return float(value) if value not in ('', None) else None
+
+
+def read_points(directory):
+    """
+    Returns:
+        {运行ID: [[C_max, TEC], ...]}，按运行ID排序
+    """
+    fronts = {}
+    for row in _read_rows(os.path.join(directory, POINTS_FILE)):
+        fronts.setdefault(int(row['运行ID']), []).append([float(row['目标1_完工时间']), float(row['目标2_能量消耗'])])
+    return dict(sorted(fronts.items()))
+
+
+def _adopt_legacy_points(directory):
+    """
+    旧版批量脚本在全部运行结束后一次写出 all_pareto_points.csv，没有 runs.csv；
+    为其中的运行补写完成记录（种子等未知信息留空），避免被当作中断的运行清除
+    """
+    if os.path.exists(os.path.join(directory, RUNS_FILE)):
+        return
+    run_ids = sorted(read_points(directory))
+    if not run_ids:
+        return
+    f, writer = _open_append(os.path.join(directory, RUNS_FILE), RUN_COLUMNS)
+    with f:
+        writer.writerows([run_id, '', '', '', '', '', '未知'] for run_id in run_ids)
+
+
+def _drop_incomplete_points(directory, completed):
+    """删除没有完成记录的运行留下的前沿点"""
+    path = os.path.join(directory, POINTS_FILE)
+    rows = _read_rows(path)
+    kept = [row for row in rows if int(row['运行ID']) in completed]
+    if len(kept) == len(rows):
+        return
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=POINT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(kept)
+
+
+def write_final_front(directory):
+    """
+    合并目录中所有运行的前沿点，去重后按完工时间排序写出 final_pareto_front.csv
+
+    Returns:
+        合并后的帕累托前沿 [[C_max, TEC], ...]
+    """
+    fronts = read_points(directory)
+    if not fronts:
+        return []
+    run_ids = np.concatenate([[run_id] * len(front) for run_id, front in fronts.items()])
+    points = np.vstack([np.asarray(front, dtype=float) for front in fronts.values()])
+    first = np.asarray(fast_non_dominated_sort(points)[0])
+    # 相同目标值只保留运行ID最小的一个
+    _, unique = np.unique(points[first], axis=0, return_index=True)
+    first = first[unique]
+    first = first[np.lexsort((run_ids[first], points[first, 1], points[first, 0]))]
+
+    with open(os.path.join(directory, FINAL_FILE), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(FINAL_COLUMNS)
+        writer.writerows([int(run_ids[i]), points[i, 0], points[i, 1], True] for i in first)
+    return points[first].tolist()
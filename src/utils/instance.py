@@ -0,0 +1,125 @@
+'''
+编译后的算例数据
+'''
+import numpy as np
+
+INELIGIBLE = -1  # 加工时间矩阵中不可加工的(工序, 机器)对
+
+
+class Instance:
+    """
+    编译后的FJSP算例（只读）
+
+    由 data.read 返回的 work、Tmachinetime 构建一次，解码、初始化、交叉、变异共享同一份数据：
+    - op_job:     (n_ops,)         每道工序所属工件（从0开始）
+    - job_start:  (n_jobs + 1,)    每个工件第一道工序的偏移，job_start[-1] == n_ops
+    - proc_time:  (n_ops, n_machines) 加工时间矩阵，不可加工处为 INELIGIBLE
+    - mach_ptr:   (n_ops + 1,)     可选机器的CSR偏移
+    - mach_idx:   工序i的可选机器为 mach_idx[mach_ptr[i]:mach_ptr[i + 1]]（从1开始，与MS编码一致）
+    - mach_time:  与 mach_idx 一一对应的加工时间
+    - min_time:   (n_ops,)         每道工序的最短加工时间
+    """
+
+    def __init__(self, work, mach_ptr, mach_idx, mach_time):
+        """
+        Args:
+            work: 每道工序所属工件（从1开始），同一工件的工序连续存放
+            mach_ptr: 可选机器的CSR偏移
+            mach_idx: 可选机器号（从1开始）
+            mach_time: 对应的加工时间
+        """
+        work = np.asarray(work, dtype=np.int64)
+        mach_ptr = np.asarray(mach_ptr, dtype=np.int64)
+        mach_idx = np.asarray(mach_idx, dtype=np.int64)
+        mach_time = np.asarray(mach_time, dtype=np.int64)
+
+        n_ops = len(work)
+        n_jobs = int(work.max())
+        n_machines = int(mach_idx.max())
+        n_eligible = np.diff(mach_ptr)
+        if len(mach_ptr) != n_ops + 1 or np.any(n_eligible <= 0):
+            raise ValueError('每道工序至少需要一台可选机器')
+        if np.any(np.diff(work) < 0):
+            raise ValueError('work 中同一工件的工序必须连续且按工件号递增')
+
+        op_of_entry = np.repeat(np.arange(n_ops), n_eligible)
+        proc_time = np.full((n_ops, n_machines), INELIGIBLE, dtype=np.int64)
+        proc_time[op_of_entry, mach_idx - 1] = mach_time
+
+        job_start = np.zeros(n_jobs + 1, dtype=np.int64)
+        job_start[1:] = np.cumsum(np.bincount(work - 1, minlength=n_jobs))
+
+        min_time = np.minimum.reduceat(mach_time, mach_ptr[:-1])
+
+        self.n_ops, self.n_jobs, self.n_machines = n_ops, n_jobs, n_machines
+        self.op_job = work - 1
+        self.job_start = job_start
+        self.proc_time = proc_time
+        self.mach_ptr = mach_ptr
+        self.mach_idx = mach_idx
+        self.mach_time = mach_time
+        self.n_eligible = n_eligible
+        self.min_time = min_time
+        for arr in (self.op_job, job_start, proc_time, mach_ptr, mach_idx, mach_time, n_eligible, min_time):
+            arr.setflags(write=False)
+
+    @classmethod
+    def from_arrays(cls, op_job, job_start, proc_time, mach_ptr, mach_idx, mach_time, n_eligible, min_time):
+        """
+        由已编译的数组直接构建（data.load 读取缓存时使用），不复制、不校验
+
+        Returns:
+            Instance
+        """
+        self = cls.__new__(cls)
+        self.n_ops, self.n_machines = proc_time.shape
+        self.n_jobs = len(job_start) - 1
+        self.op_job = op_job
+        self.job_start = job_start
+        self.proc_time = proc_time
+        self.mach_ptr = mach_ptr
+        self.mach_idx = mach_idx
+        self.mach_time = mach_time
+        self.n_eligible = n_eligible
+        self.min_time = min_time
+        for arr in (op_job, job_start, proc_time, mach_ptr, mach_idx, mach_time, n_eligible, min_time):
+            arr.setflags(write=False)
+        return self
+
+    @classmethod
+    def compile(cls, work, Tmachinetime):
+        """
+        由 data.read 的返回值构建
+
+        Args:
+            work: 每道工序所属工件
+            Tmachinetime: 每道工序的 [machine1, time1, machine2, time2, ...]
+
+        Returns:
+            Instance
+        """
+        mach_ptr = np.zeros(len(Tmachinetime) + 1, dtype=np.int64)
+        mach_ptr[1:] = np.cumsum([len(P) // 2 for P in Tmachinetime])
+        flat = np.array([v for P in Tmachinetime for v in P], dtype=np.int64)
+        return cls(work, mach_ptr, flat[0::2], flat[1::2])
+
+    @property
+    def work(self):
+        """data.read 格式的 work 列表"""
+        return (self.op_job + 1).tolist()
+
+    @property
+    def Tmachinetime(self):
+        """data.read 格式的 Tmachinetime 列表"""
+        pairs = np.stack((self.mach_idx, self.mach_time), axis=1).ravel().tolist()
+        ptr = (self.mach_ptr * 2).tolist()
+        return [pairs[ptr[i]:ptr[i + 1]] for i in range(self.n_ops)]
+
+    def eligible_machines(self, op):
+        """工序op的可选机器号（只读视图）"""
+        return self.mach_idx[self.mach_ptr[op]:self.mach_ptr[op + 1]]
+
+    def __setattr__(self, name, value):
+        if name in self.__dict__:
+            raise AttributeError(f'Instance 为只读对象，不能修改属性 {name}')
+        super().__setattr__(name, value)
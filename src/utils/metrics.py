@@ -0,0 +1,283 @@
+'''
+多目标优化的质量指标（最小化）
+
+- hypervolume：双目标超体积，排序后扫描，O(n log n)
+- Hypervolume2D：增量维护的双目标超体积，前沿增删少量点时按局部的独占贡献更新
+- igd / gd：到参考前沿的反转世代距离 / 世代距离
+- ConvergenceTrace：ga 每代结束时记录一行超体积、IGD、GD，见 ga.set_trace
+
+    h.set_trace(reference_point=[200, 20000], reference_front=load_front('results/.../final_pareto_front.csv'))
+    h.total(n_ops)
+    h.trace.to_csv('results/trace.csv')
+'''
+import csv
+import time
+from bisect import bisect_left, bisect_right
+import numpy as np
+
+# final_pareto_front.csv / all_pareto_points.csv 中目标值的列名
+OBJECTIVE_COLUMNS = ('目标1_完工时间', '目标2_能量消耗')
+TRACE_COLUMNS = ['generation', 'evaluations', 'cpu_time', 'wall_time', 'front_size', 'hypervolume', 'igd', 'gd']
+
+
+def hypervolume(front, reference_point):
+    """
+    双目标超体积：front 支配、且被 reference_point 界住的区域面积
+
+    Args:
+        front: (n, 2) 目标值，可以包含被支配的点和重复点
+        reference_point: 参考点 (r1, r2)，不严格优于参考点的点不计入
+
+    Returns:
+        超体积
+    """
+    F = np.asarray(front, dtype=float).reshape(-1, 2)
+    r1, r2 = reference_point
+    F = F[(F[:, 0] < r1) & (F[:, 1] < r2)]
+    if len(F) == 0:
+        return 0.0
+    F = F[np.lexsort((F[:, 1], F[:, 0]))]
+    # 按 f1 升序扫描，只保留 f2 严格下降的点（非支配点）
+    best = np.minimum.accumulate(F[:, 1])
+    keep = np.ones(len(F), dtype=bool)
+    keep[1:] = F[1:, 1] < best[:-1]
+    F = F[keep]
+    widths = np.diff(np.append(F[:, 0], r1))
+    return float(np.sum(widths * (r2 - F[:, 1])))
+
+
+class Hypervolume2D:
+    """
+    增量维护的双目标超体积
+
+    非支配点按 f1 升序存放（f2 严格降序）。第 i 个点的独占贡献为
+    (f1[i+1] - f1[i]) * (f2[i-1] - f2[i])（两端分别以参考点补齐），
+    插入一个点时先依次删除它支配的点、再加上它自己的独占贡献，删除时减去其独占贡献，
+    每次更新只涉及相邻的点。
+    """
+
+    def __init__(self, reference_point, front=()):
+        self.reference_point = tuple(float(v) for v in reference_point)
+        self._f1 = []
+        self._f2 = []
+        self.value = 0.0
+        for point in np.asarray(front, dtype=float).reshape(-1, 2).tolist():
+            self.add(point)
+
+    def __len__(self):
+        return len(self._f1)
+
+    def _contribution(self, i):
+        r1, r2 = self.reference_point
+        right = self._f1[i + 1] if i + 1 < len(self._f1) else r1
+        upper = self._f2[i - 1] if i > 0 else r2
+        return (right - self._f1[i]) * (upper - self._f2[i])
+
+    def add(self, point):
+        """
+        加入一个点
+
+        Returns:
+            超体积的增量（点被支配、重复或不优于参考点时为0）
+        """
+        c, t = float(point[0]), float(point[1])
+        r1, r2 = self.reference_point
+        if c >= r1 or t >= r2:
+            return 0.0
+        j = bisect_right(self._f1, c) - 1
+        if j >= 0 and self._f2[j] <= t:
+            return 0.0
+        before = self.value
+        i = bisect_left(self._f1, c)
+        while i < len(self._f1) and self._f2[i] >= t:
+            self._remove_at(i)
+        self._f1.insert(i, c)
+        self._f2.insert(i, t)
+        self.value += self._contribution(i)
+        return self.value - before
+
+    def remove(self, point):
+        """
+        删除一个点（不在集合中时忽略）
+
+        Returns:
+            超体积的减少量
+        """
+        c, t = float(point[0]), float(point[1])
+        i = bisect_left(self._f1, c)
+        if i == len(self._f1) or self._f1[i] != c or self._f2[i] != t:
+            return 0.0
+        return self._remove_at(i)
+
+    def _remove_at(self, i):
+        contribution = self._contribution(i)
+        del self._f1[i], self._f2[i]
+        self.value -= contribution
+        return contribution
+
+    def update(self, front):
+        """
+        把集合更新为 front：只增删两者不同的点，变化的点多于一半时整体重算
+
+        Returns:
+            更新后的超体积
+        """
+        r1, r2 = self.reference_point
+        new = {(c, t) for c, t in np.asarray(front, dtype=float).reshape(-1, 2).tolist() if c < r1 and t < r2}
+        old = set(zip(self._f1, self._f2))
+        added, removed = new - old, old - new
+        if 2 * (len(added) + len(removed)) > len(new) + len(old):
+            self.__init__(self.reference_point, sorted(new))
+            return self.value
+        for point in removed:
+            self.remove(point)
+        for point in added:
+            self.add(point)
+        return self.value
+
+    @property
+    def front(self):
+        """(n, 2) 当前的非支配点，按 f1 升序"""
+        return np.column_stack((self._f1, self._f2)).reshape(-1, 2)
+
+    @classmethod
+    def restore(cls, reference_point, front, value):
+        """
+        由 front 和保存的 value 恢复（不重新累加，保证之后的增量更新与保存前逐位一致）
+        """
+        hypervolume = cls(reference_point)
+        front = np.asarray(front, dtype=float).reshape(-1, 2)
+        hypervolume._f1, hypervolume._f2 = front[:, 0].tolist(), front[:, 1].tolist()
+        hypervolume.value = float(value)
+        return hypervolume
+
+
+def _scale(reference_front):
+    R = np.asarray(reference_front, dtype=float)
+    low, high = R.min(axis=0), R.max(axis=0)
+    return low, np.where(high > low, high - low, 1.0)
+
+
+def _min_distances(A, B, normalize, reference_front):
+    A = np.asarray(A, dtype=float).reshape(-1, 2)
+    B = np.asarray(B, dtype=float).reshape(-1, 2)
+    if normalize:
+        low, span = _scale(reference_front)
+        A, B = (A - low) / span, (B - low) / span
+    d = np.sqrt(((A[:, None, :] - B[None, :, :]) ** 2).sum(axis=2))
+    return d.min(axis=1)
+
+
+def igd(front, reference_front, normalize=True):
+    """
+    反转世代距离：参考前沿上每个点到 front 的最近欧氏距离的平均值
+
+    Args:
+        front: (n, M) 目标值
+        reference_front: (m, M) 参考前沿
+        normalize: 是否先按参考前沿各目标的范围归一化（完工时间与能耗量级相差很大）
+    """
+    if len(front) == 0:
+        return float('inf')
+    return float(_min_distances(reference_front, front, normalize, reference_front).mean())
+
+
+def gd(front, reference_front, normalize=True):
+    """
+    世代距离：front 上每个点到参考前沿的最近欧氏距离的平均值，参数同 igd
+    """
+    if len(front) == 0:
+        return float('inf')
+    return float(_min_distances(front, reference_front, normalize, reference_front).mean())
+
+
+def load_front(path):
+    """
+    读取 final_pareto_front.csv / all_pareto_points.csv 格式文件中的目标值
+
+    Returns:
+        (n, 2) 数组
+    """
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    return np.array([[float(row[column]) for column in OBJECTIVE_COLUMNS] for row in rows]).reshape(-1, 2)
+
+
+class ConvergenceTrace:
+    """
+    收敛轨迹：每代记录一次外部存档的超体积（增量更新）以及给出参考前沿时的 IGD、GD
+    """
+
+    def __init__(self, reference_point, reference_front=None, normalize=True):
+        """
+        Args:
+            reference_point: 超体积参考点 (C_max, TEC)
+            reference_front: 参考前沿 (m, 2)，None 时不计算 IGD、GD
+            normalize: IGD、GD 是否按参考前沿的范围归一化
+        """
+        self.reference_point = reference_point
+        self.reference_front = None if reference_front is None else np.asarray(reference_front, dtype=float)
+        self.normalize = normalize
+        self.start()
+
+    def start(self):
+        """从当前时刻开始计时并清空记录（ga.total 开始时调用）"""
+        self.hypervolume = Hypervolume2D(self.reference_point)
+        self.rows = []
+        self._version = None
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+
+    def record(self, generation, front, evaluations, version=None):
+        """
+        记录一代
+
+        Args:
+            generation: 代数
+            front: 当前的非支配前沿 (n, 2)
+            evaluations: 累计解码次数（不含缓存命中）
+            version: 前沿的版本号（如存档的 accepted 计数），与上一次记录相同时沿用上一次的指标
+        """
+        row = {'generation': generation, 'evaluations': evaluations,
+               'cpu_time': time.process_time() - self._cpu0, 'wall_time': time.perf_counter() - self._wall0}
+        if version is not None and self.rows and version == self._version:
+            last = self.rows[-1]
+            row.update((key, last[key]) for key in ('front_size', 'hypervolume', 'igd', 'gd') if key in last)
+        else:
+            row['front_size'] = len(front)
+            row['hypervolume'] = self.hypervolume.update(front)
+            if self.reference_front is not None:
+                row['igd'] = igd(front, self.reference_front, self.normalize)
+                row['gd'] = gd(front, self.reference_front, self.normalize)
+        self._version = version
+        self.rows.append(row)
+
+    def state(self):
+        """
+        Returns:
+            可写入检查点的数组字典：已记录的行（缺失的指标为 nan）、超体积的当前前沿和值、版本号
+        """
+        rows = np.array([[row.get(key, np.nan) for key in TRACE_COLUMNS] for row in self.rows],
+                        dtype=float).reshape(-1, len(TRACE_COLUMNS))
+        return {'rows': rows, 'front': self.hypervolume.front, 'value': self.hypervolume.value,
+                'version': np.array(self._version if self._version is not None else [], dtype=np.int64)}
+
+    def restore(self, state):
+        """从 state() 的结果恢复，计时接着保存时的最后一行继续"""
+        self.start()
+        self.hypervolume = Hypervolume2D.restore(self.reference_point, state['front'], state['value'])
+        integer = {'generation', 'evaluations', 'front_size'}
+        for values in np.asarray(state['rows']).tolist():
+            self.rows.append({key: int(v) if key in integer else v
+                              for key, v in zip(TRACE_COLUMNS, values) if v == v})
+        version = np.asarray(state['version']).tolist()
+        self._version = tuple(version) if version else None
+        if self.rows:
+            self._wall0 -= self.rows[-1]['wall_time']
+            self._cpu0 -= self.rows[-1]['cpu_time']
+
+    def to_csv(self, path):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=TRACE_COLUMNS, restval='')
+            writer.writeheader()
+            writer.writerows(self.rows)
@@ -1,30 +1,28 @@
 import numpy as np
 import matplotlib.pyplot as plt
-import time
 import os
-import pandas as pd
 from tqdm import tqdm
-import random
 from matplotlib.font_manager import FontProperties
 import sys
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from src.algorithms.decode import decode
-import src.utils.data as da
-from src.algorithms.GA import ga
-
-# 确保结果可重现
-np.random.seed(42)
-random.seed(42)
+from src.algorithms.sorting import fast_non_dominated_sort
+from src.utils.experiment import Experiment, read_points, read_runs, run_metric
 
 class NSGAParetoTester:
-    def __init__(self, generation=200, popsize=50, cr=0.8, mu=0.2):
-        """初始化NSGA帕累托前沿测试器"""
+    def __init__(self, generation=200, popsize=50, cr=0.8, mu=0.2, workers=None, seed=42):
+        """
+        初始化NSGA帕累托前沿测试器
+
+        workers: 并行运行的进程数，默认为CPU核数；seed: 主随机种子，每次运行的种子由它派生
+        """
         self.generation = generation
         self.popsize = popsize
         self.cr = cr
         self.mu = mu
+        self.workers = workers
+        self.seed = seed
         
         # 创建结果目录
         self.results_dir = "results"
@@ -50,48 +48,39 @@ class NSGAParetoTester:
             print(f"警告: 指定的CPU时间 {cpu_time} 不在预定义选项中，使用默认值 {self.selected_cpu_time}")
     
     def run_test(self, datasets, num_runs=10):
-        """运行性能测试"""
+        """
+        运行性能测试
+
+        所有 (数据集, 运行) 并行执行，每次运行结束即写入 all_pareto_points.csv 和 runs.csv；
+        中断后重新运行会跳过已完成的运行。
+        """
         print("开始NSGA帕累托前沿测试...")
-        
+
+        config = {'generation': self.generation, 'popsize': self.popsize, 'cr': self.cr, 'mu': self.mu,
+                  'cpu_time': self.selected_cpu_time if self.use_cpu_time_limit else None}
+        experiment = Experiment(datasets, num_runs, {'default': config}, self.results_dir, self.workers, self.seed)
+        with tqdm(total=len(datasets) * num_runs, desc="运行实验") as bar:
+            bar.update(len(datasets) * num_runs - len(experiment.pending_jobs()))
+            experiment.run(progress=lambda done, total, result: bar.update(1))
+
         # 存储所有结果
         all_results = []
         dataset_summary = []
-        
-        # 遍历每个数据集
         for dataset in datasets:
-            print(f"\n处理数据集: {dataset['name']}")
-            
-            # 创建数据来源目录
-            data_source_dir = os.path.join(self.results_dir, dataset['da'])
-            if not os.path.exists(data_source_dir):
-                os.makedirs(data_source_dir)
-            
-            # 为当前数据集创建结果目录，使用数据集名称和数据来源
-            dataset_folder_name = f"{dataset['name']}"
-            dataset_dir = os.path.join(data_source_dir, dataset_folder_name)
-            if not os.path.exists(dataset_dir):
-                os.makedirs(dataset_dir)
-            
-            # 存储当前数据集的结果
-            dataset_results = []
-            all_pareto_fronts = []
-            
-            # 运行多次实验
-            for run in tqdm(range(num_runs), desc="运行实验"):
-                # 运行算法并记录结果
-                result = self.run_single_test(dataset, run)
-                dataset_results.append(result)
-                all_results.append(result)
-                
-                # 收集帕累托前沿
-                if 'pareto_front' in result and result['pareto_front'] is not None:
-                    all_pareto_fronts.append(result['pareto_front'])
-            
-            # 保存当前数据集的帕累托前沿
-            self.save_pareto_fronts(all_pareto_fronts, dataset_dir)
-            
+            dataset_dir = experiment.output_dir(dataset, 'default')
+            fronts = read_points(dataset_dir)
+            runs = read_runs(dataset_dir)
+            dataset_results = [{
+                "数据集": dataset['name'],
+                "运行ID": int(run['运行ID']),
+                "pareto_front": fronts.get(int(run['运行ID']), []),
+                "运行时间": run_metric(run, '运行时间'),
+                "停止条件": run['停止条件'],
+            } for run in runs]
+            all_results.extend(dataset_results)
+
             # 绘制帕累托前沿图
-            self.plot_pareto_fronts(all_pareto_fronts, dataset_dir, dataset['name'])
+            self.plot_pareto_fronts(list(fronts.values()), dataset_dir, dataset['name'])
             
             # 计算并保存当前数据集的统计结果
             stats = self.calculate_statistics(dataset_results)
@@ -102,50 +91,12 @@ class NSGAParetoTester:
         print(f"\nNSGA帕累托前沿测试完成！结果已保存到 {self.results_dir} 目录")
         
         return all_results, dataset_summary
-
-    def run_single_test(self, dataset, run_id):
-        """运行单次测试"""
-        # 加载数据
-        work, Tmachinetime = da.read(dataset['da'], dataset['name'])
-
-        # 初始化解码器（修正构造函数参数）
-        de = decode(work, Tmachinetime)
-        
-        # 记录开始时间
-        start_time = time.time()
-        
-        # 初始化GA算法（修正构造函数参数）
-        ga_algo = ga(self.generation, self.popsize, self.cr, self.mu, Tmachinetime, de)
-
-        # 计算CPU时间限制（如果启用）
-        if self.use_cpu_time_limit:
-            # 计算总操作数 N
-            total_operations = len(work)
-            # 设置时间限制为 CPUtime × N
-            time_limit = (self.selected_cpu_time * total_operations)/1000.0
-            # 设置算法的时间限制
-            ga_algo.set_time_limit(time_limit)
-        
-        # 运行算法（修正调用方式和返回值）
-        pareto_front, best_code = ga_algo.total(len(work))
-        
-        # 记录结束时间
-        end_time = time.time()
-        runtime = end_time - start_time
-        
-        return {
-            "数据集": dataset['name'],
-            "运行ID": run_id + 1,
-            "pareto_front": pareto_front,
-            "运行时间": runtime,
-            "作业数": len(work),
-            "机器数": max([max(p[::2]) for p in Tmachinetime]) if Tmachinetime else 0,
-            "停止条件": "CPU时间限制" if self.use_cpu_time_limit else "迭代次数"
-        }
     
     def calculate_statistics(self, results):
-        """计算统计结果"""
-        runtimes = [r['运行时间'] for r in results]
+        """计算统计结果；运行时间未知的运行（旧版结果补写的记录）不参与统计，全部未知时为 NaN"""
+        runtimes = [r['运行时间'] for r in results if r['运行时间'] is not None]
+        if not runtimes:
+            return {"平均运行时间": np.nan, "最短运行时间": np.nan, "最长运行时间": np.nan}
         
         return {
             "平均运行时间": np.mean(runtimes),
@@ -153,52 +104,6 @@ class NSGAParetoTester:
             "最长运行时间": max(runtimes)
         }
     
-    def save_pareto_fronts(self, pareto_fronts, dataset_dir):
-        """保存帕累托前沿"""
-        # 不再为每次运行创建单独的CSV文件
-        # 而是创建一个包含所有运行结果的CSV文件，并标注运行ID
-        
-        if pareto_fronts:
-            all_points = []
-            
-            # 收集所有运行的帕累托前沿点，并标记运行ID
-            for run_id, front in enumerate(pareto_fronts):
-                if front is not None and len(front) > 0:
-                    # 为每个点添加运行ID
-                    for point in front:
-                        # 创建包含运行ID的点
-                        point_with_id = [run_id + 1, point[0], point[1]]
-                        all_points.append(point_with_id)
-            
-            if all_points:
-                # 转换为DataFrame并保存所有点
-                all_df = pd.DataFrame(all_points, columns=["运行ID", "目标1_完工时间", "目标2_能量消耗"])
-                all_df.to_csv(os.path.join(dataset_dir, "all_pareto_points.csv"), index=False)
-                print(f"已保存所有帕累托前沿点，共{len(all_points)}个点")
-                
-                # 计算并保存最终的非支配解集合（真实帕累托前沿）
-                # 注意：计算非支配解时只考虑目标值，不考虑运行ID
-                points_for_non_dominated = [[p[1], p[2]] for p in all_points]
-                final_pareto_front = self.get_non_dominated(points_for_non_dominated)
-                
-                if final_pareto_front:
-                    # 为最终帕累托前沿添加一个标识列
-                    final_points_with_id = []
-                    for point in final_pareto_front:
-                        # 查找该点来自哪次运行
-                        for original_point in all_points:
-                            if original_point[1] == point[0] and original_point[2] == point[1]:
-                                # 添加运行ID和标识为最终帕累托前沿
-                                final_points_with_id.append([original_point[0], point[0], point[1], True])
-                                break
-                    
-                    final_df = pd.DataFrame(final_points_with_id, 
-                                        columns=["运行ID", "目标1_完工时间", "目标2_能量消耗", "是否为最终帕累托解"])
-                    # 按照目标1（完工时间）排序
-                    final_df = final_df.sort_values(by=["目标1_完工时间"])
-                    final_df.to_csv(os.path.join(dataset_dir, "final_pareto_front.csv"), index=False)
-                    print(f"已保存最终帕累托前沿，共{len(final_pareto_front)}个非支配解")
-    
     def plot_pareto_fronts(self, pareto_fronts, dataset_dir, dataset_name):
         """绘制帕累托前沿图"""
         plt.figure(figsize=(12, 8))
@@ -255,21 +160,7 @@ class NSGAParetoTester:
             return []
         
         points_array = np.array(points)
-        non_dominated = []
-        
-        for i, point in enumerate(points_array):
-            dominated = False
-            for other_point in points_array:
-                # 检查other_point是否支配point
-                if (other_point[0] <= point[0] and other_point[1] <= point[1] and 
-                    (other_point[0] < point[0] or other_point[1] < point[1])):
-                    dominated = True
-                    break
-            
-            if not dominated:
-                non_dominated.append(point)
-        
-        return non_dominated
+        return list(points_array[fast_non_dominated_sort(points_array)[0]])
     
 
 def main():
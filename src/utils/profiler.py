@@ -0,0 +1,118 @@
+'''
+GA 运行过程的性能计时与进度输出
+
+    profiler = Profiler()
+    h = ga(..., profiler=profiler)
+    h.total(len(work))
+    profiler.to_json('results/profile.json')
+
+未启用时 ga 使用 NULL_PROFILER，所有钩子都是空操作。
+'''
+import csv
+import json
+import time
+
+PHASES = ('selection', 'crossover', 'mutation', 'decode', 'sort', 'crowding', 'survivor')
+
+
+class Profiler:
+    """
+    分阶段计时器
+
+    用 perf_counter_ns 的整数纳秒累加各阶段耗时，并记录解码次数和每代合并种群的各前沿规模。
+    计时方式：started = profiler.start(); ...; profiler.stop('decode', started)
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.elapsed_ns = dict.fromkeys(PHASES, 0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.evaluations = 0
+        self.generations = 0
+        self.front_sizes = []   # 每代一项：合并种群各前沿的大小
+
+    def start(self):
+        return time.perf_counter_ns()
+
+    def stop(self, phase, started):
+        """把从 started 到现在的耗时计入 phase（不在 PHASES 中的阶段名会自动新增）"""
+        self.elapsed_ns[phase] = self.elapsed_ns.get(phase, 0) + time.perf_counter_ns() - started
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    def count_evaluations(self, n):
+        self.evaluations += n
+
+    def record_fronts(self, fronts):
+        self.front_sizes.append([len(front) for front in fronts])
+
+    def end_generation(self):
+        self.generations += 1
+
+    def summary(self):
+        """
+        Returns:
+            {'phases': {阶段: {'seconds', 'calls', 'share'}}, 'total_seconds', 'evaluations', 'generations',
+             'front_sizes'}，share 为该阶段占所有计时阶段总耗时的比例
+        """
+        total = sum(self.elapsed_ns.values())
+        phases = {phase: {'seconds': ns / 1e9, 'calls': self.calls[phase], 'share': ns / total if total else 0.0}
+                  for phase, ns in self.elapsed_ns.items()}
+        return {'phases': phases, 'total_seconds': total / 1e9, 'evaluations': self.evaluations,
+                'generations': self.generations, 'front_sizes': self.front_sizes}
+
+    def to_json(self, path):
+        """导出完整统计（含每代前沿规模）"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+    def to_csv(self, path):
+        """导出各阶段耗时表"""
+        summary = self.summary()
+        with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(['阶段', '耗时(秒)', '调用次数', '占比'])
+            for phase, row in summary['phases'].items():
+                writer.writerow([phase, f"{row['seconds']:.6f}", row['calls'], f"{row['share']:.4f}"])
+            writer.writerow(['evaluations', '', summary['evaluations'], ''])
+            writer.writerow(['generations', '', summary['generations'], ''])
+
+
+class NullProfiler:
+    """未启用性能计时时使用，所有钩子都是空操作"""
+
+    enabled = False
+
+    def start(self):
+        return 0
+
+    def stop(self, phase, started):
+        pass
+
+    def count_evaluations(self, n):
+        pass
+
+    def record_fronts(self, fronts):
+        pass
+
+    def end_generation(self):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class ProgressPrinter:
+    """
+    节流的进度输出，作为 ga 的 progress 回调：两次输出之间至少间隔 interval 秒
+    """
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self._last = None
+
+    def __call__(self, generation, h):
+        now = time.perf_counter()
+        if self._last is None or now - self._last >= self.interval:
+            self._last = now
+            print('迭代次数:', generation)
@@ -0,0 +1,60 @@
+'''
+非支配排序基准测试：对比原始 O(M·N²) 排序与双目标排序-扫描、ENS-BS 的耗时
+
+运行方式（项目根目录）：
+    python -m src.utils.sort_benchmark
+'''
+import time
+import numpy as np
+from src.algorithms.sorting import fast_non_dominated_sort, efficient_non_dominated_sort, naive_non_dominated_sort
+
+SIZES = [100, 1000, 10000, 100000]
+NAIVE_MAX_N = 2000  # 原始排序为 O(N²) 纯Python循环，超过该规模不再测试
+
+
+def random_objectives(n, m, seed=0):
+    """生成与 [C_max, TEC] 相似的整数目标值（含重复解）"""
+    rng = np.random.RandomState(seed)
+    c_max = rng.randint(40, 80, n)
+    tec = rng.randint(4000, 6000, n) - 20 * c_max
+    cols = [c_max, tec] + [rng.randint(0, 100, n) for _ in range(m - 2)]
+    return np.column_stack(cols).astype(float)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def same_fronts(a, b):
+    return [sorted(f) for f in a] == [sorted(f) for f in b]
+
+
+def run(sizes=SIZES, objectives=(2, 3), naive_max_n=NAIVE_MAX_N):
+    """
+    Returns:
+        列表，每项为 {'M', 'N', 'fronts', 'naive', 'fast', 'speedup'}（时间单位：秒）
+    """
+    report = []
+    for m in objectives:
+        for n in sizes:
+            F = random_objectives(n, m)
+            sorter = fast_non_dominated_sort if m == 2 else efficient_non_dominated_sort
+            fast_time, fronts = timed(sorter, F)
+            row = {'M': m, 'N': n, 'fronts': len(fronts), 'naive': None, 'fast': fast_time, 'speedup': None}
+            if n <= naive_max_n:
+                naive_time, naive_fronts = timed(naive_non_dominated_sort, F.tolist())
+                if not same_fronts(fronts, naive_fronts):
+                    raise AssertionError(f'M={m}, N={n} 的排序结果与原始算法不一致')
+                row['naive'], row['speedup'] = naive_time, naive_time / fast_time
+            report.append(row)
+    return report
+
+
+if __name__ == '__main__':
+    print(f"{'M':>2} {'N':>7} {'前沿数':>6} {'原始(s)':>10} {'新算法(s)':>10} {'加速比':>8}")
+    for row in run():
+        naive = f"{row['naive']:.4f}" if row['naive'] is not None else '-'
+        speedup = f"{row['speedup']:.1f}x" if row['speedup'] is not None else '-'
+        print(f"{row['M']:>2} {row['N']:>7} {row['fronts']:>6} {naive:>10} {row['fast']:>10.4f} {speedup:>8}")
@@ -0,0 +1,67 @@
+'''
+稳态与代际 NSGA-II 在相同墙钟时间下的对比
+
+运行方式（项目根目录）：
+    python -m src.utils.steady_state_compare [算例名] [时间(秒)] [工作进程数] [重复次数]
+例如：
+    python -m src.utils.steady_state_compare Mk04 10 4 5
+'''
+import random
+import sys
+import numpy as np
+import src.utils.data as da
+from src.algorithms.decode import decode
+from src.algorithms.GA import ga
+from src.algorithms.selection import dominates
+from src.algorithms.steady_state import SteadyStateGA
+
+
+def coverage(front_a, front_b):
+    """C 指标：front_b 中被 front_a 中某个解支配或与之相同的比例"""
+    if not front_b:
+        return 0.0
+    covered = sum(1 for b in front_b if any(dominates(a, b) or list(a) == list(b) for a in front_a))
+    return covered / len(front_b)
+
+
+def run(instance='Mk04', seconds=10.0, workers=None, repeat=3, pop_size=50, cr=0.8, mu=0.15, da_='Brandimarte_Data'):
+    """
+    用相同种子和相同时间限制分别运行两种模式
+
+    Returns:
+        列表，每项为 {'seed', 'generational', 'steady_state', 'C(ss,gen)', 'C(gen,ss)', 'evaluations', 'utilization'}
+    """
+    work, Tmachinetime = da.read(da_, instance)
+    de = decode(work, Tmachinetime)
+    report = []
+    for seed in range(repeat):
+        fronts = {}
+        for name, cls in (('generational', ga), ('steady_state', SteadyStateGA)):
+            random.seed(seed)
+            np.random.seed(seed)
+            # 代数设得足够大，由时间限制决定何时结束
+            h = cls(10 ** 9, pop_size, cr, mu, Tmachinetime, de, workers=workers)
+            h.set_time_limit(seconds)
+            try:
+                fronts[name], _ = h.total(len(work))
+                if cls is SteadyStateGA:
+                    evaluations, utilization = h.evaluations, h.utilization()
+            finally:
+                h.close()
+        report.append({'seed': seed, 'generational': fronts['generational'], 'steady_state': fronts['steady_state'],
+                       'C(ss,gen)': coverage(fronts['steady_state'], fronts['generational']),
+                       'C(gen,ss)': coverage(fronts['generational'], fronts['steady_state']),
+                       'evaluations': evaluations, 'utilization': utilization})
+    return report
+
+
+if __name__ == '__main__':
+    instance = sys.argv[1] if len(sys.argv) > 1 else 'Mk04'
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    repeat = int(sys.argv[4]) if len(sys.argv) > 4 else 3
+    rows = run(instance, seconds, workers, repeat)
+    print(f"{'种子':>4} {'C(稳态,代际)':>12} {'C(代际,稳态)':>12} {'稳态评估数':>10} {'利用率':>8}")
+    for row in rows:
+        utilization = f"{row['utilization']:.0%}" if row['utilization'] is not None else '-'
+        print(f"{row['seed']:>4} {row['C(ss,gen)']:>12.2f} {row['C(gen,ss)']:>12.2f} {row['evaluations']:>10} {utilization:>8}")
@@ -0,0 +1,43 @@
+import importlib.util
+import math
+import os
+import pytest
+from src.utils.experiment import Experiment, POINTS_FILE, read_runs, run_metric
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _legacy_experiment(tmp_path):
+    """旧版批量脚本的输出：只有 all_pareto_points.csv，没有 runs.csv"""
+    dataset = {'name': 'Mk01', 'da': 'Brandimarte_Data'}
+    experiment = Experiment([dataset], 2, results_dir=str(tmp_path))
+    directory = experiment.output_dir(dataset, 'default')
+    os.makedirs(directory)
+    with open(os.path.join(directory, POINTS_FILE), 'w', encoding='utf-8') as f:
+        f.write('运行ID,目标1_完工时间,目标2_能量消耗\n1,42,5095.0\n1,43,4985.0\n2,44,4900.0\n')
+    return experiment, directory
+
+
+def test_adopted_legacy_runs_have_no_metrics(tmp_path):
+    experiment, directory = _legacy_experiment(tmp_path)
+    assert experiment.pending_jobs() == []
+    runs = read_runs(directory)
+    assert [run['运行ID'] for run in runs] == ['1', '2']
+    assert all(run_metric(run, '运行时间') is None for run in runs)
+
+
+def test_statistics_skip_adopted_legacy_runs(tmp_path):
+    pytest.importorskip('tqdm')
+    spec = importlib.util.spec_from_file_location('performance_test',
+                                                  os.path.join(ROOT, 'src', 'utils', 'performance _test.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    experiment, directory = _legacy_experiment(tmp_path)
+    experiment.pending_jobs()
+    results = [{'运行时间': run_metric(run, '运行时间')} for run in read_runs(directory)]
+    tester = module.NSGAParetoTester.__new__(module.NSGAParetoTester)
+    assert all(math.isnan(value) for value in tester.calculate_statistics(results).values())
+
+    results.append({'运行时间': 1.5})
+    assert tester.calculate_statistics(results) == {'平均运行时间': 1.5, '最短运行时间': 1.5, '最长运行时间': 1.5}